@@ -0,0 +1,300 @@
+"""
+A* paralelo com distribuição dos estados por hash (HDA*).
+
+Cada estado pertence a um único trabalhador (processo), escolhido por um hash
+do código compacto. Cada trabalhador tem sua própria fila de prioridade
+(FilaBaldes) e sua tabela de g; um filho que pertence a outro trabalhador vai
+para uma caixa de saída e é enviado em lotes de até LOTE entradas pela fila
+de mensagens do dono, que também é esvaziada a cada INTERVALO_ENVIO
+expansões para não atrasar o trabalho alheio.
+
+A melhor solução encontrada (incumbente) fica num valor compartilhado e todo
+nó com g + h maior ou igual ao seu custo é descartado. A busca termina quando
+todos os trabalhadores estão ociosos (fila vazia, caixas de saída enviadas) e
+todo lote enviado já foi recebido, conferido em duas leituras seguidas com os
+mesmos totais (contagem de mensagens de Mattern). Nesse ponto nenhum nó com
+f menor que a incumbente existe em fila ou em trânsito, então, com a
+heurística admissível (Manhattan), a solução é ótima.
+
+Uso (comparação de tempo com a_star de um processo):
+    python a_star_paralelo.py [instancias] [qtd_movimentos]
+"""
+
+import csv
+import multiprocessing as mp
+import queue
+import random
+import sys
+import time
+from tp1_completo import (DESLOCAMENTOS, VIZINHOS_VAZIO, DISTANCIA_MANHATTAN, FilaBaldes, Orcamento,
+                          objetivo, a_star, estado_para_compacto, compacto_para_estado, tabuleiro_para_estado,
+                          distancia_manhattan_compacta, gerar_estado_inicial_soluvel,
+                          iniciar_orcamento, registrar_estruturas, registrar_resultado)
+
+LOTE = 256               # entradas por mensagem entre trabalhadores
+INTERVALO_ENVIO = 128    # expansões entre envios forçados e leituras de mensagens
+ESPERA = 0.002           # s de espera por mensagens quando ocioso
+SEM_CUSTO = 1 << 62      # custo da incumbente antes da primeira solução
+
+_MULTIPLICADOR = 0x9E3779B97F4A7C15
+
+# Contadores por trabalhador no array compartilhado: [ocioso, enviados, recebidos]
+_OCIOSO, _ENVIADOS, _RECEBIDOS = range(3)
+
+
+def dono(codigo, trabalhadores):
+    """Trabalhador dono de um estado (hash multiplicativo do código compacto)."""
+    return ((codigo * _MULTIPLICADOR) >> 64) % trabalhadores
+
+
+def _trabalhador(indice, trabalhadores, codigo_objetivo, entradas, resultados, custo,
+                 contadores, travas, expandidos):
+    """Laço de um trabalhador: recebe lotes, expande os seus nós e envia os alheios."""
+    for fila_mensagens in entradas:
+        # Lotes ainda não lidos no encerramento podem ser descartados
+        fila_mensagens.cancel_join_thread()
+    entrada = entradas[indice]
+    trava = travas[indice]
+    base = 3 * indice
+    fila = FilaBaldes()
+    melhor_g = {}
+    pais = {}
+    saidas = [[] for _ in range(trabalhadores)]
+    nos_expandidos = 0
+    pico_fronteira = 0
+    desde_envio = 0
+    incumbente = custo.value
+
+    def obsoleta(g, entrada_fila):
+        return g > melhor_g[entrada_fila[0]]
+
+    def enviar(destino):
+        lote = saidas[destino]
+        saidas[destino] = []
+        with trava:
+            contadores[base + _ENVIADOS] += 1
+        entradas[destino].put(lote)
+
+    def receber(lote):
+        for codigo, vazio, g, h, pai, anterior in lote:
+            if g + h < incumbente and g < melhor_g.get(codigo, SEM_CUSTO):
+                melhor_g[codigo] = g
+                pais[codigo] = pai
+                fila.inserir(g + h, g, (codigo, vazio, h, anterior))
+
+    while True:
+        if not fila or desde_envio >= INTERVALO_ENVIO:
+            desde_envio = 0
+            for destino in range(trabalhadores):
+                if saidas[destino]:
+                    enviar(destino)
+            expandidos[indice] = nos_expandidos
+            if not fila:
+                with trava:
+                    contadores[base + _OCIOSO] = 1
+            bloquear = not fila
+            while True:
+                try:
+                    mensagem = entrada.get(timeout=ESPERA) if bloquear else entrada.get_nowait()
+                except queue.Empty:
+                    break
+                bloquear = False
+                if isinstance(mensagem, list):
+                    with trava:
+                        contadores[base + _OCIOSO] = 0
+                        contadores[base + _RECEBIDOS] += 1
+                    incumbente = custo.value
+                    receber(mensagem)
+                elif mensagem[0] == "pai":
+                    resultados.put(("pai", pais.get(mensagem[1])))
+                else:  # "fim"
+                    resultados.put(("fim", indice, nos_expandidos, pico_fronteira, len(melhor_g)))
+                    return
+            incumbente = custo.value
+            if len(fila) > pico_fronteira:
+                pico_fronteira = len(fila)
+
+        item = fila.retirar(obsoleta)
+        if item is None:
+            continue
+        f, g, (codigo, vazio, h, anterior) = item
+        if f >= incumbente:
+            continue
+        nos_expandidos += 1
+        desde_envio += 1
+
+        if codigo == codigo_objetivo:
+            with custo.get_lock():
+                if g < custo.value:
+                    custo.value = g
+                incumbente = custo.value
+            continue
+
+        desloc_vazio = DESLOCAMENTOS[vazio]
+        novo_g = g + 1
+        for destino, desloc in VIZINHOS_VAZIO[vazio]:
+            if destino == anterior:
+                continue
+            peca = (codigo >> desloc) & 0xF
+            novo_codigo = codigo - (peca << desloc) + (peca << desloc_vazio)
+            distancias_peca = DISTANCIA_MANHATTAN[peca]
+            novo_h = h + distancias_peca[vazio] - distancias_peca[destino]
+            if novo_g + novo_h >= incumbente:
+                continue
+            responsavel = dono(novo_codigo, trabalhadores)
+            if responsavel == indice:
+                if novo_g < melhor_g.get(novo_codigo, SEM_CUSTO):
+                    melhor_g[novo_codigo] = novo_g
+                    pais[novo_codigo] = codigo
+                    fila.inserir(novo_g + novo_h, novo_g, (novo_codigo, destino, novo_h, vazio))
+            else:
+                saida = saidas[responsavel]
+                saida.append((novo_codigo, destino, novo_g, novo_h, codigo, vazio))
+                if len(saida) >= LOTE:
+                    enviar(responsavel)
+
+
+def a_star_paralelo(inicial, objetivo, trabalhadores=4, estatisticas=None, orcamento=None):
+    """
+    HDA* com `trabalhadores` processos e heurística Manhattan. Retorna
+    (caminho, nos_expandidos) como a_star, com a soma das expansões de todos
+    os trabalhadores; em `estatisticas` ficam também as expansões de cada um
+    e o número de lotes trocados. Não pode ser chamado de dentro de um
+    processo daemon (por exemplo, um job do Pool do benchmark).
+
+    O `orcamento` é verificado pelo coordenador: a memória soma o RSS de
+    todos os trabalhadores, mas o limite de expansões é aproximado, porque
+    cada trabalhador só publica sua contagem a cada INTERVALO_ENVIO
+    expansões e só para ao ler a mensagem de fim. A busca pode passar do
+    limite em algumas centenas de expansões por trabalhador, e o total
+    retornado é o número real de expansões.
+    """
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    entradas = [mp.Queue() for _ in range(trabalhadores)]
+    resultados = mp.Queue()
+    custo = mp.Value("q", SEM_CUSTO)
+    contadores = mp.Array("q", 3 * trabalhadores, lock=False)
+    travas = [mp.Lock() for _ in range(trabalhadores)]
+    expandidos = mp.Array("q", trabalhadores, lock=False)
+    processos = [mp.Process(target=_trabalhador, daemon=True,
+                            args=(i, trabalhadores, codigo_objetivo, entradas, resultados, custo,
+                                  contadores, travas, expandidos))
+                 for i in range(trabalhadores)]
+    for processo in processos:
+        processo.start()
+
+    # O lote inicial é enviado pelo coordenador e conta nos totais de mensagens
+    h_inicial = distancia_manhattan_compacta(codigo_inicial)
+    entradas[dono(codigo_inicial, trabalhadores)].put(
+        [(codigo_inicial, inicial.index(0), 0, h_inicial, None, -1)])
+    enviados_coordenador = 1
+    orcamento_original = orcamento
+    if orcamento is not None:
+        # Mesmos limites, mas a memória conta também os trabalhadores
+        orcamento = Orcamento(orcamento.max_expansoes, orcamento.tempo_maximo,
+                              orcamento.memoria_maxima_mb, incluir_filhos=True)
+    iniciar_orcamento(orcamento)
+
+    totais_anteriores = None
+    interrompida = False
+    while True:
+        time.sleep(ESPERA)
+        if any(p.exitcode not in (None, 0) for p in processos):
+            raise RuntimeError("um trabalhador do A* paralelo terminou com erro")
+        if orcamento is not None and orcamento.esgotado(sum(expandidos)):
+            interrompida = True
+            break
+        onda = []
+        for i, trava in enumerate(travas):
+            with trava:
+                onda.append(tuple(contadores[3 * i:3 * i + 3]))
+        ociosos = all(o[_OCIOSO] for o in onda)
+        totais = (enviados_coordenador + sum(o[_ENVIADOS] for o in onda),
+                  sum(o[_RECEBIDOS] for o in onda))
+        if ociosos and totais[0] == totais[1]:
+            if totais == totais_anteriores:
+                break
+            totais_anteriores = totais
+        else:
+            totais_anteriores = None
+
+    caminho = None
+    if not interrompida and custo.value < SEM_CUSTO:
+        # Segue os pais de trás para frente, perguntando a cada dono
+        codigos = []
+        codigo = codigo_objetivo
+        while codigo is not None:
+            codigos.append(codigo)
+            entradas[dono(codigo, trabalhadores)].put(("pai", codigo))
+            _, codigo = resultados.get()
+        codigos.pop()  # o estado inicial não entra no caminho
+        caminho = [compacto_para_estado(c) for c in reversed(codigos)]
+
+    for fila_mensagens in entradas:
+        fila_mensagens.put(("fim",))
+    finais = sorted(resultados.get() for _ in processos)
+    for processo in processos:
+        processo.join()
+
+    nos_expandidos = sum(final[2] for final in finais)
+    registrar_estruturas(estatisticas,
+                         sum(final[3] for final in finais), sum(final[4] for final in finais))
+    if orcamento is not None:
+        orcamento_original.motivo = orcamento.motivo
+    registrar_resultado(estatisticas, caminho, orcamento)
+    if estatisticas is not None:
+        estatisticas["expandidos_por_trabalhador"] = [final[2] for final in finais]
+        estatisticas["lotes"] = totais_anteriores[0] if totais_anteriores else None
+    return caminho, nos_expandidos
+
+
+# =========================
+# Comparação com o A* de um processo
+# =========================
+
+def comparar_aceleracao(instancias=5, qtd_movimentos=60, trabalhadores=(2, 4, 8, 16), seed=0,
+                        arquivo="aceleracao_paralela.csv"):
+    """
+    Resolve `instancias` tabuleiros com a_star e com a_star_paralelo para
+    cada número de trabalhadores, confere que o número de passos é o mesmo e
+    grava tempos, expansões e aceleração (tempo do a_star / tempo paralelo).
+    """
+    random.seed(seed)
+    meta = tabuleiro_para_estado(objetivo)
+    linhas = []
+    for instancia in range(instancias):
+        inicial = tabuleiro_para_estado(gerar_estado_inicial_soluvel(qtd_movimentos))
+        inicio = time.perf_counter()
+        caminho, expandidos = a_star(inicial, meta)
+        tempo_serial = time.perf_counter() - inicio
+        linhas.append({"Instancia": instancia, "Trabalhadores": 1, "Tempo": tempo_serial,
+                       "Expandidos": expandidos, "Passos": len(caminho), "Aceleracao": 1.0})
+        for n in trabalhadores:
+            inicio = time.perf_counter()
+            caminho_paralelo, expandidos = a_star_paralelo(inicial, meta, n)
+            tempo = time.perf_counter() - inicio
+            if len(caminho_paralelo) != len(caminho):
+                raise AssertionError(f"instância {instancia}: {len(caminho_paralelo)} passos "
+                                     f"com {n} trabalhadores, {len(caminho)} no a_star")
+            linhas.append({"Instancia": instancia, "Trabalhadores": n, "Tempo": tempo,
+                           "Expandidos": expandidos, "Passos": len(caminho_paralelo),
+                           "Aceleracao": tempo_serial / tempo})
+
+    with open(arquivo, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(linhas[0]))
+        writer.writeheader()
+        writer.writerows(linhas)
+
+    print(f"{'Trabalhadores':>13} {'Tempo médio':>12} {'Expandidos':>12} {'Aceleração':>11}")
+    for n in (1,) + tuple(trabalhadores):
+        grupo = [l for l in linhas if l["Trabalhadores"] == n]
+        print(f"{n:>13} {sum(l['Tempo'] for l in grupo) / len(grupo):>12.3f} "
+              f"{sum(l['Expandidos'] for l in grupo) / len(grupo):>12.0f} "
+              f"{sum(l['Aceleracao'] for l in grupo) / len(grupo):>11.2f}")
+    return linhas
+
+
+if __name__ == "__main__":
+    comparar_aceleracao(int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+                        int(sys.argv[2]) if len(sys.argv) > 2 else 60)
@@ -5,6 +5,15 @@ import matplotlib.ticker as ticker
 from pathlib import Path
 import re
 from matplotlib.gridspec import GridSpec
+from resultados_colunares import (carregar_resultados_colunares, anexar_movimentos,
+                                  frequencia_movimentos, distribuicao_tamanhos,
+                                  movimentos_por_posicao, sem_acertos_cache,
+                                  algoritmos_presentes as listar_algoritmos,
+                                  cores_algoritmos, memoria_por_job,
+                                  CORES_ALGORITMOS, MARCADORES_ALGORITMOS)
+
+# Ordem em que as direções aparecem nos gráficos de movimentos
+ORDEM_MOVIMENTOS = ['direita', 'esquerda', 'cima', 'baixo']
 
 # Configuração global de estilo para os gráficos
 plt.rcParams['font.size'] = 12
@@ -28,22 +37,33 @@ def formatar_numero(x, pos):
 
 # Função para carregar os dados
 def carregar_dados(caminho_arquivo):
-    """Carrega o arquivo CSV e retorna um DataFrame pandas."""
+    """
+    Carrega o arquivo de resultados e retorna um DataFrame pandas. Arquivos
+    .npz (formato colunar) são lidos diretamente, sem avaliar linha a linha.
+    Linhas respondidas pelo cache de soluções ficam de fora.
+    """
     try:
-        df = pd.read_csv(caminho_arquivo)
+        if str(caminho_arquivo).endswith('.npz'):
+            df = carregar_resultados_colunares(caminho_arquivo)
+        else:
+            df = pd.read_csv(caminho_arquivo)
         print(f"Arquivo carregado com sucesso! Dimensões: {df.shape}")
+        df = sem_acertos_cache(df)
 
         # Processamento inicial dos dados
         if 'Directions' in df.columns:
-            # Converter strings de direções em listas e calcular tamanho
+            # Converter strings de direções em listas e codificar os movimentos
+            # (TamanhoSolucao, InicioMovimentos e df.attrs['movimentos'])
             df['DirectionsList'] = df['Directions'].apply(
                 lambda x: eval(x) if isinstance(x, str) and x.startswith('[') else []
             )
-            df['TamanhoSolucao'] = df['DirectionsList'].apply(len)
+            anexar_movimentos(df, df['DirectionsList'])
 
-        # Calcular consumo de memória
-        if 'MemMBFim' in df.columns and 'MemMBInicio' in df.columns:
-            df['ConsumoMemoria'] = df['MemMBFim'] - df['MemMBInicio']
+        # Calcular consumo de memória: o pico medido por job (MemPicoMB),
+        # quando existir, substitui a diferença entre início e fim
+        consumo = memoria_por_job(df)
+        if consumo is not None:
+            df['ConsumoMemoria'] = consumo
 
         return df
     except Exception as e:
@@ -104,12 +124,9 @@ def grafico_evolucao_temporal(df, nome_arquivo="evolucao_temporal.png"):
     # Ordenar o DataFrame por algoritmo e iteração para análise sequencial
     df_sorted = df.sort_values(['Algorithm', 'Iteration'])
 
-    # Garantir ordem consistente dos algoritmos
-    ordem_algoritmos = ['BFS', 'DFS', 'A*']
-    algoritmos_presentes = [algo for algo in ordem_algoritmos if algo in df['Algorithm'].unique()]
-
-    # Definir cores para os algoritmos (ordem consistente)
-    colors = {'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}
+    # Garantir ordem e cores consistentes dos algoritmos
+    algoritmos_presentes = listar_algoritmos(df)
+    colors = CORES_ALGORITMOS
 
     # Criar três figuras separadas em vez de subplots
 
@@ -234,12 +251,13 @@ def grafico_comparativo_algoritmos(df, stats, nome_arquivo="comparativo_algoritm
     """
     Cria gráficos comparativos entre os algoritmos em diferentes métricas, separados em arquivos individuais.
     """
-    algoritmos = df['Algorithm'].unique()
+    algoritmos = listar_algoritmos(df)
+    cores = cores_algoritmos(algoritmos)
 
     # 1. Gráfico de Barras: Tempo Médio
     plt.figure(figsize=(10, 7))
-    tempos = df.groupby('Algorithm')['Time'].mean()
-    bars = plt.bar(algoritmos, tempos, color=['blue', 'red', 'green'])
+    tempos = df.groupby('Algorithm')['Time'].mean().reindex(algoritmos)
+    bars = plt.bar(algoritmos, tempos, color=cores)
 
     # Adicionar valores nas barras
     for bar, valor in zip(bars, tempos):
@@ -269,8 +287,8 @@ def grafico_comparativo_algoritmos(df, stats, nome_arquivo="comparativo_algoritm
 
     # 2. Gráfico de Barras: Nós Expandidos (médio)
     plt.figure(figsize=(10, 7))
-    nos = df.groupby('Algorithm')['Expanded'].mean()
-    bars = plt.bar(algoritmos, nos, color=['blue', 'red', 'green'])
+    nos = df.groupby('Algorithm')['Expanded'].mean().reindex(algoritmos)
+    bars = plt.bar(algoritmos, nos, color=cores)
 
     # Adicionar valores nas barras (formatados para K ou M)
     for bar, valor in zip(bars, nos):
@@ -301,8 +319,8 @@ def grafico_comparativo_algoritmos(df, stats, nome_arquivo="comparativo_algoritm
     plt.figure(figsize=(10, 7))
 
     # Definir cores e marcadores para algoritmos
-    cores = {'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}
-    marcadores = {'BFS': 'o', 'DFS': 's', 'A*': '^'}
+    cores = CORES_ALGORITMOS
+    marcadores = MARCADORES_ALGORITMOS
 
     for algo in algoritmos:
         subset = df[df['Algorithm'] == algo]
@@ -334,8 +352,8 @@ def grafico_comparativo_algoritmos(df, stats, nome_arquivo="comparativo_algoritm
     plt.figure(figsize=(10, 7))
 
     # Taxa de sucesso (barras)
-    taxa_sucesso = df.groupby('Algorithm')['Found'].mean() * 100
-    bars1 = plt.bar(algoritmos, taxa_sucesso, color=['blue', 'red', 'green'], alpha=0.7)
+    taxa_sucesso = df.groupby('Algorithm')['Found'].mean().reindex(algoritmos) * 100
+    bars1 = plt.bar(algoritmos, taxa_sucesso, color=cores, alpha=0.7)
 
     # Adicionar valores nas barras
     for bar, valor in zip(bars1, taxa_sucesso):
@@ -358,8 +376,9 @@ def grafico_comparativo_algoritmos(df, stats, nome_arquivo="comparativo_algoritm
     # Calcular passos médios para soluções encontradas
     df_solved = df[df['Found'] == True]
     if not df_solved.empty:
-        passos_medios = df_solved.groupby('Algorithm')['Steps'].mean()
-        bars = plt.bar(algoritmos, passos_medios, color=['blue', 'red', 'green'])
+        passos_medios = df_solved.groupby('Algorithm')['Steps'].mean().reindex(
+            listar_algoritmos(df_solved))
+        bars = plt.bar(passos_medios.index, passos_medios, color=cores_algoritmos(passos_medios.index))
 
         # Adicionar valores nas barras
         for bar, valor in zip(bars, passos_medios):
@@ -462,6 +481,16 @@ def grafico_solucionabilidade(df, nome_arquivo="analise_solucionabilidade.png"):
     return dados_solucionabilidade_resumidos
 
 
+def garantir_movimentos_codificados(df):
+    """Codifica as direções de df (coluna Directions) se ainda não estiverem codificadas."""
+    if 'movimentos' not in df.attrs:
+        if 'DirectionsList' not in df.columns:
+            df['DirectionsList'] = df['Directions'].apply(
+                lambda x: eval(x) if isinstance(x, str) and x.startswith('[') else []
+            )
+        anexar_movimentos(df, df['DirectionsList'])
+
+
 # Função para análise de movimentos na solução
 def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
     """
@@ -475,28 +504,17 @@ def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
         return None
 
     # Garantir ordem consistente dos algoritmos
-    ordem_algoritmos = ['BFS', 'DFS', 'A*']
-    algoritmos_presentes = [algo for algo in ordem_algoritmos if algo in df_solved['Algorithm'].unique()]
+    algoritmos_presentes = listar_algoritmos(df_solved)
 
-    # Converter strings de direções em listas se necessário
-    if 'DirectionsList' not in df_solved.columns:
-        df_solved['DirectionsList'] = df_solved['Directions'].apply(
-            lambda x: eval(x) if isinstance(x, str) and x.startswith('[') else []
-        )
+    # Movimentos codificados (ver carregar_dados); contagens por bincount
+    garantir_movimentos_codificados(df_solved)
+    frequencia = frequencia_movimentos(df_solved)[ORDEM_MOVIMENTOS]
 
     # 1. Frequência total de movimentos
     plt.figure(figsize=(10, 7))
 
-    # Contar frequência de movimentos
-    movimento_counts = {'direita': 0, 'esquerda': 0, 'cima': 0, 'baixo': 0}
-
-    for directions in df_solved['DirectionsList']:
-        for direction in directions:
-            if direction in movimento_counts:
-                movimento_counts[direction] += 1
-
-    movimentos = list(movimento_counts.keys())
-    freq = list(movimento_counts.values())
+    movimentos = ORDEM_MOVIMENTOS
+    freq = frequencia.sum().tolist()
 
     # Gráfico de barras para frequência total
     bars = plt.bar(movimentos, freq, color=['#3498db', '#e74c3c', '#2ecc71', '#f39c12'])
@@ -526,15 +544,8 @@ def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
     # 2. Frequência de movimentos por algoritmo
     plt.figure(figsize=(10, 7))
 
-    # Calcular frequência por algoritmo
-    movimento_por_algo = {algo: {'direita': 0, 'esquerda': 0, 'cima': 0, 'baixo': 0}
-                          for algo in algoritmos_presentes}
-
-    for idx, row in df_solved.iterrows():
-        if row['Algorithm'] in movimento_por_algo:  # Verificar se o algoritmo está no dicionário
-            for direction in row['DirectionsList']:
-                if direction in movimento_por_algo[row['Algorithm']]:
-                    movimento_por_algo[row['Algorithm']][direction] += 1
+    # Frequência por algoritmo
+    movimento_por_algo = frequencia.reindex(algoritmos_presentes).to_dict('index')
 
     # Preparar dados para gráfico de barras agrupadas
     x = np.arange(len(movimentos))
@@ -577,11 +588,9 @@ def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
     # 3. Distribuição do tamanho das soluções
     plt.figure(figsize=(10, 7))
 
-    # Calcular comprimento das soluções
-    df_solved.loc[:, 'TamanhoSolucao'] = df_solved['DirectionsList'].apply(len)
-
-    # Histograma dos tamanhos de solução
-    plt.hist(df_solved['TamanhoSolucao'], bins=15, alpha=0.7, color='#3498db')
+    # Histograma dos tamanhos de solução (contagens por tamanho via bincount)
+    distribuicao = distribuicao_tamanhos(df_solved).sum()
+    plt.bar(distribuicao.index, distribuicao.values, width=1.0, alpha=0.7, color='#3498db')
     plt.title('Distribuição do Tamanho das Soluções')
     plt.xlabel('Número de Passos')
     plt.ylabel('Frequência')
@@ -597,15 +606,12 @@ def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
     plt.figure(figsize=(10, 7))
 
     # Calcular tamanho médio por algoritmo
-    tamanho_medio = {}
-    for algo in algoritmos_presentes:
-        df_algo = df_solved[df_solved['Algorithm'] == algo]
-        if not df_algo.empty:
-            tamanho_medio[algo] = df_algo['TamanhoSolucao'].mean()
+    tamanho_medio = df_solved.groupby('Algorithm')['TamanhoSolucao'].mean().reindex(
+        algoritmos_presentes).to_dict()
 
     # Gráfico de barras
     if tamanho_medio:  # Verificar se há dados
-        cores = ['blue', 'red', 'green'][:len(tamanho_medio)]
+        cores = cores_algoritmos(tamanho_medio)
         bars = plt.bar(list(tamanho_medio.keys()), list(tamanho_medio.values()), color=cores)
 
         # Adicionar valores nas barras
@@ -626,6 +632,24 @@ def grafico_analise_movimentos(df, nome_arquivo="analise_movimentos.png"):
 
     plt.close()
 
+    # 5. Proporção de cada direção por posição no caminho
+    por_posicao = movimentos_por_posicao(df_solved)[ORDEM_MOVIMENTOS]
+    if not por_posicao.empty:
+        plt.figure(figsize=(10, 7))
+        proporcao = por_posicao.div(por_posicao.sum(axis=1), axis=0)
+        plt.stackplot(proporcao.index + 1, proporcao.T.values, labels=ORDEM_MOVIMENTOS,
+                      colors=['#3498db', '#e74c3c', '#2ecc71', '#f39c12'], alpha=0.8)
+        plt.title('Proporção de Movimentos por Posição na Solução')
+        plt.xlabel('Passo')
+        plt.ylabel('Proporção')
+        plt.legend(loc='upper right')
+
+        plt.tight_layout()
+        nome_arquivo_posicao = nome_arquivo.replace('.png', '_por_posicao.png')
+        plt.savefig(nome_arquivo_posicao)
+        print(f"Gráfico '{nome_arquivo_posicao}' gerado.")
+        plt.close()
+
     print(f"Todos os gráficos de análise de movimentos foram gerados.")
 
     return True
@@ -657,6 +681,19 @@ def analisar_desempenho(df):
         if 'ConsumoMemoria' in df.columns:
             print(f"  Consumo médio de memória: {df_algo['ConsumoMemoria'].mean():.2f} MB")
 
+        # Buscas bidirecionais: nós expandidos em cada direção
+        if 'ExpandidosFrente' in df.columns and df_algo['ExpandidosFrente'].notna().any():
+            print(f"  Nós expandidos (frente, média): {df_algo['ExpandidosFrente'].mean():.2f}")
+            print(f"  Nós expandidos (trás, média): {df_algo['ExpandidosTras'].mean():.2f}")
+
+    # Comparação das versões bidirecionais com as unidirecionais
+    for uni, bi in (('BFS', 'BFS-Bi'), ('A*', 'A*-Bi')):
+        if uni in df['Algorithm'].values and bi in df['Algorithm'].values:
+            media_uni = df[df['Algorithm'] == uni]['Expanded'].mean()
+            media_bi = df[df['Algorithm'] == bi]['Expanded'].mean()
+            if media_bi > 0:
+                print(f"\n{bi} expande {media_uni / media_bi:.2f}x menos nós que {uni}")
+
 
 # Função principal
 def main():
@@ -664,7 +701,7 @@ def main():
     print("===== ANÁLISE DE ALGORITMOS PARA 15-PUZZLE =====")
 
     # Solicitar o caminho do arquivo
-    caminho_arquivo = input("Digite o caminho do arquivo CSV (ou pressione Enter para usar 'puzzle_data.csv'): ")
+    caminho_arquivo = input("Digite o caminho do arquivo CSV ou .npz (ou pressione Enter para usar 'puzzle_data.csv'): ")
     if not caminho_arquivo:
         caminho_arquivo = 'puzzle_data.csv'
 
@@ -697,8 +734,7 @@ def main():
     todos_dados = {}
 
     # Garantir ordem consistente dos algoritmos em todos os gráficos
-    ordem_algoritmos = ['BFS', 'DFS', 'A*']
-    algoritmos_presentes = [algo for algo in ordem_algoritmos if algo in df['Algorithm'].unique()]
+    algoritmos_presentes = listar_algoritmos(df)
 
     # Evolução temporal dos algoritmos
     # 1. Taxa de Sucesso Acumulada
@@ -710,10 +746,10 @@ def main():
         total_count = np.arange(1, len(df_algo) + 1)
         success_rate = (success_count / total_count) * 100
         plt.plot(total_count, success_rate, 'o-',
-                 color={'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}.get(algo, 'gray'),
+                 color=CORES_ALGORITMOS.get(algo, 'gray'),
                  label=f'{algo} - Final: {success_rate.iloc[-1]:.2f}%', markersize=4)
         plt.axhline(y=success_rate.iloc[-1], linestyle='--',
-                    color={'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}.get(algo, 'gray'), alpha=0.7)
+                    color=CORES_ALGORITMOS.get(algo, 'gray'), alpha=0.7)
     plt.xlabel('Número de Execuções')
     plt.ylabel('Taxa de Sucesso Acumulada (%)')
     plt.title('Análise de Sucesso - Evolução Temporal')
@@ -736,7 +772,7 @@ def main():
         else:
             rolling_time = df_algo['Time']
         plt.plot(np.arange(1, len(df_algo) + 1), rolling_time, 'o-',
-                 color={'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}.get(algo, 'gray'),
+                 color=CORES_ALGORITMOS.get(algo, 'gray'),
                  label=f'{algo} - Média: {df_algo["Time"].mean():.4f}s', markersize=4)
     plt.xlabel('Número de Execuções')
     plt.ylabel('Tempo de Execução (segundos)')
@@ -761,7 +797,7 @@ def main():
     # 1. Tempo Médio
     plt.figure(figsize=(10, 7))
     tempos = [df[df['Algorithm'] == algo]['Time'].mean() for algo in algoritmos_presentes]
-    cores = ['blue', 'red', 'green'][:len(algoritmos_presentes)]
+    cores = cores_algoritmos(algoritmos_presentes)
     bars = plt.bar(algoritmos_presentes, tempos, color=cores)
     for bar, valor in zip(bars, tempos):
         if valor < 0.01:
@@ -879,17 +915,11 @@ def main():
     # Análise de movimentos
     df_solved = df[df['Found'] == True].copy()
     if not df_solved.empty:
-        if 'DirectionsList' not in df_solved.columns:
-            df_solved['DirectionsList'] = df_solved['Directions'].apply(
-                lambda x: eval(x) if isinstance(x, str) and x.startswith('[') else []
-            )
+        garantir_movimentos_codificados(df_solved)
+        frequencia = frequencia_movimentos(df_solved)[ORDEM_MOVIMENTOS]
 
         # 1. Frequência total de movimentos
-        movimento_counts = {'direita': 0, 'esquerda': 0, 'cima': 0, 'baixo': 0}
-        for directions in df_solved['DirectionsList']:
-            for direction in directions:
-                if direction in movimento_counts:
-                    movimento_counts[direction] += 1
+        movimento_counts = {mov: int(n) for mov, n in frequencia.sum().items()}
 
         plt.figure(figsize=(10, 7))
         movimentos = list(movimento_counts.keys())
@@ -914,22 +944,12 @@ def main():
         plt.close()
 
         # Salvar dados de movimentos
-        movimento_por_algo = {}
-        for algo in algoritmos_presentes:
-            movimento_por_algo[algo] = {'direita': 0, 'esquerda': 0, 'cima': 0, 'baixo': 0}
-            df_algo = df_solved[df_solved['Algorithm'] == algo]
-            for idx, row in df_algo.iterrows():
-                for direction in row['DirectionsList']:
-                    if direction in movimento_por_algo[algo]:
-                        movimento_por_algo[algo][direction] += 1
+        movimento_por_algo = {algo: {mov: int(n) for mov, n in contagens.items()}
+                              for algo, contagens in frequencia.iterrows()
+                              if algo in algoritmos_presentes}
 
         # Tamanho das soluções
-        df_solved.loc[:, 'TamanhoSolucao'] = df_solved['DirectionsList'].apply(len)
-        tamanho_medio = {}
-        for algo in algoritmos_presentes:
-            df_algo = df_solved[df_solved['Algorithm'] == algo]
-            if not df_algo.empty:
-                tamanho_medio[algo] = df_algo['TamanhoSolucao'].mean()
+        tamanho_medio = df_solved.groupby('Algorithm')['TamanhoSolucao'].mean().to_dict()
 
         dados_movimentos = {
             'movimento_total': movimento_counts,
@@ -945,7 +965,7 @@ def main():
         # Calcular diferentes métricas de memória
         df_mem['ConsumoMemoria'] = df_mem['MemMBFim'] - df_mem['MemMBInicio']
         df_mem['ConsumoMemoriaAbs'] = abs(df_mem['ConsumoMemoria'])
-        df_mem['PicoMemoria'] = df_mem[['MemMBInicio', 'MemMBFim']].max(axis=1)
+        df_mem['PicoMemoria'] = memoria_por_job(df_mem, "pico")
 
         # Gráfico de pico de memória
         plt.figure(figsize=(10, 7))
@@ -963,7 +983,7 @@ def main():
 
         # Criar barras para valores médios
         valores_medios = [pico_por_algo[algo]['mean'] for algo in algoritmos_presentes]
-        cores = ['blue', 'red', 'green'][:len(algoritmos_presentes)]
+        cores = cores_algoritmos(algoritmos_presentes)
         bars = plt.bar(algoritmos_presentes, valores_medios, color=cores, alpha=0.7)
 
         # Adicionar valores nas barras
@@ -997,6 +1017,11 @@ def main():
                                  for algo in algoritmos_presentes},
             'pico_memoria': pico_por_algo
         }
+        # Tamanho das estruturas de busca no pico (fronteira e visitados)
+        for coluna, chave in (('PicoFronteira', 'pico_fronteira'), ('PicoVisitados', 'pico_visitados')):
+            if coluna in df_mem.columns:
+                dados_memoria[chave] = {algo: df_mem[df_mem['Algorithm'] == algo][coluna].mean()
+                                        for algo in algoritmos_presentes}
         todos_dados['memoria'] = str(dados_memoria)
 
     # Salvar todos os dados em um único arquivo de texto estruturado para análise por outra LLM
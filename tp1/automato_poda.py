@@ -0,0 +1,168 @@
+"""
+Autômato de poda de sequências duplicadas de movimentos.
+
+Muitas sequências curtas de movimentos do vazio levam ao mesmo estado (a
+mais simples é desfazer o último movimento; há ciclos de comprimento 12).
+Este módulo enumera offline, num tabuleiro virtual sem bordas, todas as
+sequências de até `comprimento` movimentos em ordem (tamanho, lexicográfica).
+Uma sequência cujo efeito já foi obtido por outra anterior é proibida, desde
+que a caixa percorrida pelo vazio na sequência mantida caiba na caixa da
+proibida: assim, sempre que a proibida é possível no tabuleiro 4x4, a
+mantida também é, e trocar uma pela outra não alonga nenhum caminho.
+
+As sequências proibidas viram um autômato (Aho-Corasick) no formato de
+tp1_completo.AUTOMATO_INVERSO: uma tupla de estados, cada um com o próximo
+estado para os movimentos 0=cima, 1=baixo, 2=esquerda, 3=direita, ou -1 se o
+movimento completa uma sequência proibida. As buscas em profundidade (dfs,
+ida_star) recebem o autômato pelo argumento `automato`.
+
+Uso offline:
+    python automato_poda.py 12
+"""
+
+import os
+import sys
+import time
+from collections import deque
+import numpy as np
+from tp1_completo import movimentos
+
+PASTA_PADRAO = os.path.dirname(os.path.abspath(__file__))
+COMPRIMENTO_PADRAO = 12
+
+_automatos = {}
+
+
+def nome_arquivo_automato(comprimento, pasta=PASTA_PADRAO):
+    """Caminho do arquivo .npy de um autômato."""
+    return os.path.join(pasta, f"automato_poda-{comprimento}.npy")
+
+
+def _contida(interna, externa):
+    """Se a caixa (lmin, lmax, cmin, cmax) `interna` cabe em `externa`."""
+    return (interna[0] >= externa[0] and interna[1] <= externa[1]
+            and interna[2] >= externa[2] and interna[3] <= externa[3])
+
+
+def sequencias_proibidas(comprimento):
+    """
+    Enumera as sequências proibidas de até `comprimento` movimentos. Só são
+    estendidas as sequências mantidas, e uma extensão que termina em uma
+    sequência já proibida é descartada sem contar como nova proibição.
+    """
+    proibidas = set()
+    # efeito -> caixas das sequências mantidas com esse efeito
+    mantidos = {frozenset(): [(0, 0, 0, 0)]}
+    # (sequência, posição do vazio, conteúdo deslocado {posição: peça}, caixa)
+    camada = [((), (0, 0), {}, (0, 0, 0, 0))]
+
+    for _ in range(comprimento):
+        proxima = []
+        for sequencia, (l, c), conteudo, caixa in camada:
+            for movimento, (dl, dc) in enumerate(movimentos):
+                nova = sequencia + (movimento,)
+                if any(nova[i:] in proibidas for i in range(1, len(nova))):
+                    continue
+                destino = (l + dl, c + dc)
+                # O vazio é tratado como a peça de rótulo (0, 0): mover é trocar
+                novo_conteudo = dict(conteudo)
+                peca = conteudo.get(destino, destino)
+                vazio = conteudo.get((l, c), (l, c))
+                for posicao, rotulo in (((l, c), peca), (destino, vazio)):
+                    if rotulo == posicao:
+                        novo_conteudo.pop(posicao, None)
+                    else:
+                        novo_conteudo[posicao] = rotulo
+                nova_caixa = (min(caixa[0], destino[0]), max(caixa[1], destino[0]),
+                              min(caixa[2], destino[1]), max(caixa[3], destino[1]))
+
+                efeito = frozenset(novo_conteudo.items())
+                caixas = mantidos.setdefault(efeito, [])
+                if any(_contida(mantida, nova_caixa) for mantida in caixas):
+                    proibidas.add(nova)
+                else:
+                    caixas.append(nova_caixa)
+                    proxima.append((nova, destino, novo_conteudo, nova_caixa))
+        camada = proxima
+    return proibidas
+
+
+def construir_automato(proibidas):
+    """
+    Monta o autômato de Aho-Corasick das sequências proibidas e retorna a
+    tabela de transições (array int32 n x 4, -1 = movimento podado), só com
+    os estados em que nenhuma sequência proibida terminou.
+    """
+    filhos = [{}]
+    terminal = [False]
+    for sequencia in proibidas:
+        no = 0
+        for movimento in sequencia:
+            if movimento not in filhos[no]:
+                filhos[no][movimento] = len(filhos)
+                filhos.append({})
+                terminal.append(False)
+            no = filhos[no][movimento]
+        terminal[no] = True
+
+    # Ligações de falha em largura; transições completas δ(estado, movimento)
+    falha = [0] * len(filhos)
+    transicoes = [[0] * 4 for _ in filhos]
+    fila = deque()
+    for movimento in range(4):
+        filho = filhos[0].get(movimento)
+        if filho is None:
+            transicoes[0][movimento] = 0
+        else:
+            transicoes[0][movimento] = filho
+            fila.append(filho)
+    while fila:
+        no = fila.popleft()
+        terminal[no] = terminal[no] or terminal[falha[no]]
+        for movimento in range(4):
+            filho = filhos[no].get(movimento)
+            if filho is None:
+                transicoes[no][movimento] = transicoes[falha[no]][movimento]
+            else:
+                falha[filho] = transicoes[falha[no]][movimento]
+                transicoes[no][movimento] = filho
+                fila.append(filho)
+
+    # Renumera só os estados vivos; transições para estados terminais viram -1
+    vivos = [no for no in range(len(filhos)) if not terminal[no]]
+    novo_numero = {no: i for i, no in enumerate(vivos)}
+    tabela = np.array([[novo_numero.get(transicoes[no][m], -1) for m in range(4)] for no in vivos],
+                      dtype=np.int32)
+    return tabela
+
+
+def salvar_automato(comprimento=COMPRIMENTO_PADRAO, pasta=PASTA_PADRAO):
+    """Gera e salva em disco o autômato de um comprimento."""
+    inicio = time.time()
+    proibidas = sequencias_proibidas(comprimento)
+    tabela = construir_automato(proibidas)
+    temporario = nome_arquivo_automato(comprimento, pasta) + ".tmp.npy"
+    np.save(temporario, tabela)
+    os.replace(temporario, nome_arquivo_automato(comprimento, pasta))
+    print(f"Comprimento {comprimento}: {len(proibidas)} sequências proibidas, "
+          f"{len(tabela)} estados, {time.time() - inicio:.1f}s")
+    return tabela
+
+
+def carregar_automato(comprimento=COMPRIMENTO_PADRAO, pasta=PASTA_PADRAO):
+    """
+    Carrega o autômato como tupla de tuplas (o formato aceito pelas buscas),
+    gerando e salvando o arquivo se ainda não existir.
+    """
+    arquivo = nome_arquivo_automato(comprimento, pasta)
+    if arquivo not in _automatos:
+        if os.path.exists(arquivo):
+            tabela = np.load(arquivo)
+        else:
+            tabela = salvar_automato(comprimento, pasta)
+        _automatos[arquivo] = tuple(tuple(linha) for linha in tabela.tolist())
+    return _automatos[arquivo]
+
+
+if __name__ == "__main__":
+    salvar_automato(int(sys.argv[1]) if len(sys.argv) > 1 else COMPRIMENTO_PADRAO)
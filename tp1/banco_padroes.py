@@ -0,0 +1,155 @@
+"""
+Bancos de dados de padrões (PDB) aditivos e disjuntos para o 15-puzzle.
+
+Cada padrão é um grupo de peças. A tabela guarda, para cada combinação de
+posições dessas peças, o número mínimo de movimentos *das peças do padrão*
+necessários para levá-las ao objetivo. Como os grupos são disjuntos e só os
+movimentos das próprias peças são contados, os valores de todos os padrões
+podem ser somados sem perder a admissibilidade.
+
+As tabelas são construídas offline por BFS retrógrada a partir do objetivo,
+salvas como arrays NumPy (.npy) e carregadas com memory mapping, então o
+custo de inicialização de uma busca fica praticamente nulo.
+
+Uso offline:
+    python banco_padroes.py 5-5-5
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from tp1_completo import DESLOCAMENTOS, objetivo, tabuleiro_para_estado
+
+# Partições conhecidas das 15 peças em grupos disjuntos
+PARTICOES = {
+    "5-5-5": ((1, 2, 3, 4, 7), (5, 6, 9, 10, 13), (8, 11, 12, 14, 15)),
+    "6-6-3": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bd_padroes")
+
+SEM_VALOR = 255
+
+# (delta de linha, delta de coluna) do vazio: cima, baixo, esquerda, direita
+_DIRECOES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def nome_arquivo_padrao(padrao, pasta=PASTA_PADRAO):
+    """Caminho do arquivo .npy de um padrão."""
+    return os.path.join(pasta, "padrao-" + "-".join(str(p) for p in padrao) + ".npy")
+
+
+def _expandir(codigos, k):
+    """
+    Gera, de forma vetorizada, os vizinhos de um lote de estados abstratos.
+    Um estado abstrato guarda a posição de cada peça do padrão (nibble i) e a
+    do vazio (nibble k). Retorna (vizinhos de custo 0, vizinhos de custo 1):
+    mover o vazio sobre uma peça fora do padrão não é contado.
+    """
+    desloc_vazio = 4 * k
+    vazio = (codigos >> desloc_vazio) & 0xF
+    linha, coluna = vazio >> 2, vazio & 3
+    posicoes = [(codigos >> (4 * i)) & 0xF for i in range(k)]
+    custo_zero, custo_um = [], []
+
+    for dl, dc in _DIRECOES:
+        validos = (linha + dl >= 0) & (linha + dl < 4) & (coluna + dc >= 0) & (coluna + dc < 4)
+        alvo = vazio + (4 * dl + dc)
+        ocupante = np.full(codigos.shape, -1, dtype=np.int64)
+        for i in range(k):
+            ocupante[posicoes[i] == alvo] = i
+
+        livre = validos & (ocupante < 0)
+        custo_zero.append(codigos[livre] + ((alvo[livre] - vazio[livre]) << desloc_vazio))
+
+        peca = validos & (ocupante >= 0)
+        desloc_peca = 4 * ocupante[peca]
+        custo_um.append(codigos[peca]
+                        + ((vazio[peca] - alvo[peca]) << desloc_peca)
+                        + ((alvo[peca] - vazio[peca]) << desloc_vazio))
+
+    return np.concatenate(custo_zero), np.concatenate(custo_um)
+
+
+def construir_padrao(padrao):
+    """
+    Constrói a tabela de um padrão por BFS 0-1 retrógrada a partir do objetivo.
+    Retorna um array uint8 de 16**k posições, indexado por
+    sum(posição da peça i << 4*i); combinações impossíveis ficam com 255.
+    """
+    k = len(padrao)
+    meta = tabuleiro_para_estado(objetivo)
+    inicio = meta.index(0) << (4 * k)
+    for i, peca in enumerate(padrao):
+        inicio |= meta.index(peca) << (4 * i)
+
+    # A construção usa os estados com o vazio (16**(k+1) bytes: 16 MB para
+    # k=5, 256 MB para k=6); a tabela final descarta a posição do vazio.
+    distancias = np.full(16 ** (k + 1), SEM_VALOR, dtype=np.uint8)
+    fronteira = np.array([inicio], dtype=np.int64)
+    distancias[fronteira] = 0
+    custo = 0
+
+    while fronteira.size:
+        # Fecho de custo 0: o vazio anda livremente pelas peças fora do padrão
+        camadas = [fronteira]
+        camada = fronteira
+        while camada.size:
+            vizinhos, _ = _expandir(camada, k)
+            vizinhos = np.unique(vizinhos)
+            camada = vizinhos[distancias[vizinhos] == SEM_VALOR]
+            distancias[camada] = custo
+            camadas.append(camada)
+
+        _, vizinhos = _expandir(np.concatenate(camadas), k)
+        vizinhos = np.unique(vizinhos)
+        fronteira = vizinhos[distancias[vizinhos] == SEM_VALOR]
+        custo += 1
+        distancias[fronteira] = custo
+
+    # O nibble do vazio é o mais significativo: mínimo sobre as 16 posições
+    return distancias.reshape(16, 16 ** k).min(axis=0)
+
+
+def construir_particao(particao="5-5-5", pasta=PASTA_PADRAO):
+    """Constrói e salva em disco as tabelas de todos os padrões de uma partição."""
+    os.makedirs(pasta, exist_ok=True)
+    for padrao in PARTICOES.get(particao, particao):
+        inicio = time.time()
+        tabela = construir_padrao(padrao)
+        np.save(nome_arquivo_padrao(padrao, pasta), tabela)
+        print(f"Padrão {padrao}: {tabela.nbytes} bytes, "
+              f"máximo {tabela[tabela != SEM_VALOR].max()}, {time.time() - inicio:.1f}s")
+
+
+def carregar_particao(particao="5-5-5", pasta=PASTA_PADRAO):
+    """Carrega (via memory mapping) as tabelas de uma partição já construída."""
+    return [(tuple(padrao), np.load(nome_arquivo_padrao(padrao, pasta), mmap_mode="r"))
+            for padrao in PARTICOES.get(particao, particao)]
+
+
+def heuristica_bd_padroes(particao="5-5-5", pasta=PASTA_PADRAO):
+    """
+    Retorna uma função heurística h(codigo) com a soma dos padrões da partição,
+    pronta para ser passada como `heuristica` para a_star e ida_star.
+    """
+    tabelas = [(padrao, memoryview(tabela)) for padrao, tabela in carregar_particao(particao, pasta)]
+
+    def heuristica(codigo):
+        posicoes = [0] * 16
+        for p, desloc in enumerate(DESLOCAMENTOS):
+            posicoes[(codigo >> desloc) & 0xF] = p
+        total = 0
+        for padrao, tabela in tabelas:
+            indice = 0
+            for i, peca in enumerate(padrao):
+                indice |= posicoes[peca] << (4 * i)
+            total += tabela[indice]
+        return total
+
+    return heuristica
+
+
+if __name__ == "__main__":
+    construir_particao(sys.argv[1] if len(sys.argv) > 1 else "5-5-5")
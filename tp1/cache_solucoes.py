@@ -0,0 +1,114 @@
+"""
+Cache persistente (SQLite) de soluções ótimas do 15-puzzle.
+
+A chave é o código compacto do tabuleiro inicial (tp1_completo); o valor é
+a distância ótima até o objetivo e a sequência de movimentos do vazio, um
+byte por movimento na ordem de `movimentos` (0=cima, 1=baixo, 2=esquerda,
+3=direita). O arquivo é compartilhado entre iterações, algoritmos, processos
+do pool e execuções diferentes; o modo WAL permite leituras concorrentes.
+
+O tamanho é limitado a `max_entradas`: ao passar do limite, as entradas
+usadas há mais tempo são removidas (LRU pelo instante do último uso).
+"""
+
+import sqlite3
+import time
+from tp1_completo import MOVIMENTO_POR_DIFERENCA, estado_para_compacto, mover_estado, movimentos
+
+ARQUIVO_CACHE = "cache_solucoes.sqlite"
+
+
+def _chave(codigo):
+    """Código compacto (até 2**64 - 1) como inteiro com sinal, aceito pelo SQLite."""
+    return codigo - (1 << 64) if codigo >= (1 << 63) else codigo
+
+
+def codificar_caminho(inicial, caminho):
+    """Converte o caminho (lista de estados, sem o inicial) em bytes de movimentos."""
+    codigos = []
+    vazio = inicial.index(0)
+    for estado in caminho:
+        novo_vazio = estado.index(0)
+        codigos.append(MOVIMENTO_POR_DIFERENCA[novo_vazio - vazio])
+        vazio = novo_vazio
+    return bytes(codigos)
+
+
+def decodificar_caminho(inicial, codigos):
+    """Reaplica os movimentos a partir do estado inicial e devolve o caminho."""
+    caminho = []
+    estado = inicial
+    for codigo in codigos:
+        estado = mover_estado(estado, movimentos[codigo])
+        caminho.append(estado)
+    return caminho
+
+
+class CacheSolucoes:
+    """
+    Acesso ao cache em disco. `acertos` e `faltas` contam as consultas feitas
+    por esta instância. Pode ser usado como gerenciador de contexto.
+    """
+
+    def __init__(self, caminho=ARQUIVO_CACHE, max_entradas=1_000_000):
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.faltas = 0
+        self.conexao = sqlite3.connect(caminho, timeout=60)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS solucoes ("
+            " codigo INTEGER PRIMARY KEY, distancia INTEGER NOT NULL,"
+            " movimentos BLOB NOT NULL, uso INTEGER NOT NULL)")
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS solucoes_uso ON solucoes (uso)")
+        self.conexao.commit()
+        # Contagem aproximada das entradas: outros processos também inserem,
+        # então ela é recontada (count(*), que percorre a tabela) só quando
+        # parece passar do limite.
+        self.entradas = len(self)
+
+    def buscar(self, inicial):
+        """Retorna o caminho ótimo guardado para `inicial` ou None."""
+        chave = _chave(estado_para_compacto(inicial))
+        linha = self.conexao.execute(
+            "SELECT movimentos FROM solucoes WHERE codigo = ?", (chave,)).fetchone()
+        if linha is None:
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        with self.conexao:
+            self.conexao.execute("UPDATE solucoes SET uso = ? WHERE codigo = ?",
+                                 (time.time_ns(), chave))
+        return decodificar_caminho(inicial, linha[0])
+
+    def guardar(self, inicial, caminho):
+        """Guarda um caminho ótimo e remove as entradas mais antigas se preciso."""
+        codigos = codificar_caminho(inicial, caminho)
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO solucoes VALUES (?, ?, ?, ?)",
+                (_chave(estado_para_compacto(inicial)), len(codigos), codigos, time.time_ns()))
+            self.entradas += 1
+            if self.entradas <= self.max_entradas:
+                return
+            self.entradas = self.conexao.execute("SELECT count(*) FROM solucoes").fetchone()[0]
+            excesso = self.entradas - self.max_entradas
+            if excesso > 0:
+                # Remove um lote (10% do limite) para não despejar a cada inserção
+                lote = excesso + self.max_entradas // 10
+                self.conexao.execute(
+                    "DELETE FROM solucoes WHERE codigo IN "
+                    "(SELECT codigo FROM solucoes ORDER BY uso LIMIT ?)", (lote,))
+                self.entradas -= lote
+
+    def __len__(self):
+        return self.conexao.execute("SELECT count(*) FROM solucoes").fetchone()[0]
+
+    def fechar(self):
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.ticker as ticker
 from pathlib import Path
+from resultados_colunares import (carregar_resultados_colunares, sem_acertos_cache,
+                                  algoritmos_presentes, memoria_por_job, CORES_ALGORITMOS)
 
 # Função para análise do consumo de memória com tratamento de valores negativos
 def analisar_memoria(df, salvar_grafico=True, nome_arquivo="consumo_memoria_ajustado.png"):
@@ -26,8 +28,8 @@ def analisar_memoria(df, salvar_grafico=True, nome_arquivo="consumo_memoria_ajus
     print("\nEstatísticas de MemMBFim:")
     print(df_mem.groupby('Algorithm')['MemMBFim'].describe())
     
-    # Calcular consumo usando valores absolutos
-    df_mem['ConsumoMemoria'] = df_mem['MemMBFim'] - df_mem['MemMBInicio']
+    # Calcular consumo usando valores absolutos (ou o pico medido por job)
+    df_mem['ConsumoMemoria'] = memoria_por_job(df_mem)
     df_mem['ConsumoMemoriaAbs'] = abs(df_mem['ConsumoMemoria'])
     
     # Verificar quantos valores negativos existem
@@ -71,8 +73,8 @@ def analisar_memoria(df, salvar_grafico=True, nome_arquivo="consumo_memoria_ajus
         plt.figure(figsize=(12, 8))
         
         # Gráfico de barras para cada algoritmo
-        algoritmos = df_mem['Algorithm'].unique()
-        cores = {'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}
+        algoritmos = algoritmos_presentes(df_mem)
+        cores = CORES_ALGORITMOS
         
         # Dados para o gráfico
         consumo_abs = [consumo_abs_por_algo[algo] for algo in algoritmos]
@@ -152,21 +154,28 @@ def analisar_pico_memoria(df):
     # Criar cópia para análise
     df_mem = df.copy()
     
-    # Calcular o máximo das duas medidas para cada execução
-    df_mem['PicoMemoria'] = df_mem[['MemMBInicio', 'MemMBFim']].max(axis=1)
+    # Usar o pico medido por job; sem ele, o máximo das duas medidas
+    df_mem['PicoMemoria'] = memoria_por_job(df_mem, "pico")
     
     # Analisar por algoritmo
-    pico_por_algo = df_mem.groupby('Algorithm')['PicoMemoria'].agg(['mean', 'max', 'min'])
+    pico_por_algo = df_mem.groupby('Algorithm')['PicoMemoria'].agg(['mean', 'max', 'min']).reindex(
+        algoritmos_presentes(df_mem))
     
     print("\n===== ANÁLISE DE PICO DE CONSUMO DE MEMÓRIA =====")
     print("\nEstatísticas de pico de memória por algoritmo:")
     print(pico_por_algo)
     
+    # Tamanho das estruturas no pico (estados na fronteira e nos visitados)
+    colunas_estruturas = [c for c in ('PicoFronteira', 'PicoVisitados') if c in df_mem.columns]
+    if colunas_estruturas:
+        print("\nTamanho médio das estruturas de busca no pico:")
+        print(df_mem.groupby('Algorithm')[colunas_estruturas].mean())
+    
     # Criar gráfico de pico de memória
     plt.figure(figsize=(12, 8))
     
     algoritmos = pico_por_algo.index
-    cores = {'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}
+    cores = CORES_ALGORITMOS
     
     # Criar barras para valores médios
     bars = plt.bar(algoritmos, pico_por_algo['mean'], 
@@ -205,11 +214,16 @@ def analisar_pico_memoria(df):
 # Função para demonstrar como usar as análises de memória
 def exemplo_analise_memoria(caminho_arquivo='puzzle_data.csv'):
     """
-    Exemplo de como usar as funções de análise de memória.
+    Exemplo de como usar as funções de análise de memória. Aceita o CSV ou
+    o arquivo colunar .npz do benchmark.
     """
     try:
-        df = pd.read_csv(caminho_arquivo)
+        if str(caminho_arquivo).endswith('.npz'):
+            df = carregar_resultados_colunares(caminho_arquivo)
+        else:
+            df = pd.read_csv(caminho_arquivo)
         print(f"Arquivo carregado com sucesso! Dimensões: {df.shape}")
+        df = sem_acertos_cache(df)
         
         # Executar análises de memória
         df_mem = analisar_memoria(df)
@@ -224,12 +238,12 @@ if __name__ == "__main__":
     print("Esse script pode ser executado diretamente para analisar o consumo de memória.")
     print("Ou importado como módulo para uso em outros scripts.")
     
-    # Verificar se o arquivo padrão existe
-    arquivo_padrao = 'resultados.csv'
-    if Path(arquivo_padrao).exists():
-        exemplo_analise_memoria(arquivo_padrao)
+    # Verificar se o arquivo padrão existe (o .npz tem preferência)
+    arquivos_padrao = [a for a in ('resultados.npz', 'resultados.csv') if Path(a).exists()]
+    if arquivos_padrao:
+        exemplo_analise_memoria(arquivos_padrao[0])
     else:
-        print(f"Arquivo '{arquivo_padrao}' não encontrado.")
-        caminho = input("Digite o caminho do arquivo CSV para análise: ")
+        print("Arquivos 'resultados.npz' e 'resultados.csv' não encontrados.")
+        caminho = input("Digite o caminho do arquivo CSV ou .npz para análise: ")
         if caminho:
             exemplo_analise_memoria(caminho)
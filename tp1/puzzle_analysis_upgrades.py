@@ -4,6 +4,7 @@ import numpy as np
 import matplotlib.ticker as ticker
 from pathlib import Path
 import re
+from resultados_colunares import algoritmos_presentes, memoria_por_job, CORES_ALGORITMOS
 
 # Configuração global de estilo para os gráficos
 plt.rcParams['font.size'] = 12
@@ -137,17 +138,18 @@ def grafico_memoria(df, nome_arquivo="consumo_memoria.png"):
         print("Colunas de memória não encontradas no DataFrame.")
         return None
     
-    # Calcular consumo de memória
-    df['ConsumoMemoria'] = df['MemMBFim'] - df['MemMBInicio']
+    # Calcular consumo de memória (pico medido por job, quando disponível)
+    df['ConsumoMemoria'] = memoria_por_job(df)
     
     # Agrupar por algoritmo
-    memoria_algo = df.groupby('Algorithm')['ConsumoMemoria'].agg(['mean', 'max', 'min'])
+    memoria_algo = df.groupby('Algorithm')['ConsumoMemoria'].agg(['mean', 'max', 'min']).reindex(
+        algoritmos_presentes(df))
     
     # Criar gráfico
     plt.figure(figsize=(10, 7))
     
     # Configurar cores
-    colors = {'BFS': 'blue', 'DFS': 'red', 'A*': 'green'}
+    colors = CORES_ALGORITMOS
     
     # Criar barras para cada algoritmo
     algoritmos = memoria_algo.index
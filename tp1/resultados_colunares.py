@@ -0,0 +1,270 @@
+"""
+Formato colunar binário (.npz) para os resultados do benchmark.
+
+Cada coluna do CSV vira um array NumPy tipado. Os tabuleiros iniciais são
+guardados como códigos compactos uint64 (4 bits por posição, como em
+tp1_completo) e as direções de todas as soluções ficam concatenadas em um
+único array de bytes (0=cima, 1=baixo, 2=esquerda, 3=direita) com um array
+de offsets: os movimentos da linha i são movimentos[offsets[i]:offsets[i+1]].
+
+Carregar o arquivo não avalia nada linha a linha, então um milhão de linhas
+sobe em poucos segundos.
+
+Uso (converter um CSV antigo):
+    python resultados_colunares.py resultados.csv [resultados.npz]
+"""
+
+import csv
+import re
+import sys
+import numpy as np
+import pandas as pd
+
+DIRECOES = ("cima", "baixo", "esquerda", "direita")
+CODIGO_DIRECAO = {direcao: codigo for codigo, direcao in enumerate(DIRECOES)}
+
+# Tipo de cada coluna; colunas opcionais (vazias em parte das linhas) são
+# float para poderem guardar NaN.
+COLUNAS_INTEIRAS = ("Iteration", "Expanded", "Steps", "QtdMovimentos", "Seed",
+                    "Inversoes", "LinhaVazio", "PID")
+COLUNAS_REAIS = ("Time", "CPUTime", "ProfundidadeMaximaDFS", "MemMBInicio", "MemMBFim",
+                 "ExpandidosFrente", "ExpandidosTras", "DuplicadosPodados",
+                 "ObsoletosDescartados", "Reaberturas", "PodasAutomato", "TaxaAcertosTabela",
+                 "MemPicoMB", "PicoFronteira", "PicoVisitados", "LimiteExpansoes",
+                 "LimiteTempo", "LimiteMemoriaMB")
+COLUNAS_LOGICAS = ("Found", "Solvable")
+COLUNAS_TEXTO = ("Algorithm", "Resultado", "MotivoOrcamento", "Cache", "Melhorias")
+
+# Ordem, cor e marcador de cada algoritmo nos gráficos das análises; uma
+# entrada por chave de ALGORITMOS em tp1_task3-4-5_analisys.py. Variantes
+# usam um tom da cor do algoritmo base.
+ORDEM_ALGORITMOS = ("BFS", "DFS", "DFS-Poda", "DFS-TT", "A*", "WA*", "A*-Anytime",
+                    "IDA*", "IDA*-Poda", "IDA*-TT", "BFS-Bi", "A*-Bi")
+CORES_ALGORITMOS = {"BFS": "blue", "DFS": "red", "DFS-Poda": "salmon", "DFS-TT": "darkred",
+                    "A*": "green", "WA*": "yellowgreen", "A*-Anytime": "darkgreen",
+                    "IDA*": "purple", "IDA*-Poda": "orchid", "IDA*-TT": "indigo",
+                    "BFS-Bi": "cyan", "A*-Bi": "olive"}
+MARCADORES_ALGORITMOS = {"BFS": "o", "DFS": "s", "DFS-Poda": "<", "DFS-TT": ">",
+                         "A*": "^", "WA*": "X", "A*-Anytime": "*", "IDA*": "D",
+                         "IDA*-Poda": "h", "IDA*-TT": "p", "BFS-Bi": "v", "A*-Bi": "P"}
+
+_DESLOCAMENTOS = np.arange(16, dtype=np.uint64) * np.uint64(4)
+
+
+def codificar_direcoes(direcoes):
+    """Converte uma lista de nomes de direção para bytes (um código por movimento)."""
+    return bytes(CODIGO_DIRECAO[d] for d in direcoes)
+
+
+def codificar_tabuleiros_lote(tabuleiros):
+    """
+    Codifica cada linha de um array (n, 16) como uma chave uint64 com 4 bits
+    por posição (mesma disposição de estado_para_compacto).
+    """
+    return np.bitwise_or.reduce(np.asarray(tabuleiros, dtype=np.uint64) << _DESLOCAMENTOS, axis=1)
+
+
+def codificar_tabuleiros(textos):
+    """Converte as representações '[[...], ...]' dos tabuleiros para códigos uint64."""
+    valores = np.array([[int(v) for v in re.findall(r"\d+", texto)] for texto in textos],
+                       dtype=np.int64).reshape(-1, 16)
+    return codificar_tabuleiros_lote(valores)
+
+
+def _real(valor):
+    return float(valor) if valor not in ("", None) else np.nan
+
+
+def _logico(valor):
+    return valor is True or valor == "True"
+
+
+def gravar_resultados_colunares(linhas, caminho="resultados.npz"):
+    """
+    Grava as linhas do benchmark (dicionários no formato do CSV, com
+    Directions como lista ou como texto) em um arquivo .npz colunar.
+    """
+    colunas = {}
+    for nome in COLUNAS_INTEIRAS:
+        colunas[nome] = np.array([int(l.get(nome) or 0) for l in linhas], dtype=np.int64)
+    for nome in COLUNAS_REAIS:
+        colunas[nome] = np.array([_real(l.get(nome)) for l in linhas], dtype=np.float64)
+    for nome in COLUNAS_LOGICAS:
+        colunas[nome] = np.array([_logico(l.get(nome)) for l in linhas], dtype=bool)
+    for nome in COLUNAS_TEXTO:
+        colunas[nome] = np.array([str(l.get(nome) or "") for l in linhas], dtype=np.str_)
+
+    colunas["CodigoTabuleiro"] = codificar_tabuleiros([str(l["InitialBoard"]) for l in linhas])
+
+    sequencias = []
+    for l in linhas:
+        direcoes = l["Directions"]
+        if isinstance(direcoes, str):
+            direcoes = re.findall(r"[a-z]+", direcoes)
+        sequencias.append(codificar_direcoes(direcoes))
+    colunas["Movimentos"] = np.frombuffer(b"".join(sequencias), dtype=np.uint8)
+    offsets = np.zeros(len(linhas) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in sequencias], out=offsets[1:])
+    colunas["Offsets"] = offsets
+
+    np.savez(caminho, **colunas)
+
+
+def carregar_resultados_colunares(caminho):
+    """
+    Carrega um arquivo .npz colunar como DataFrame. As colunas escalares vêm
+    tipadas e CodigoTabuleiro traz os tabuleiros compactos. Os movimentos de
+    todas as linhas ficam em df.attrs["movimentos"] (bytes, lidos como array
+    por movimentos_codificados); cada linha guarda onde os seus começam
+    (InicioMovimentos) e quantos são (TamanhoSolucao), o que continua válido
+    depois de filtrar o DataFrame.
+    """
+    with np.load(caminho, allow_pickle=False) as dados:
+        colunas = {nome: dados[nome] for nome in dados.files}
+    movimentos = colunas.pop("Movimentos")
+    offsets = colunas.pop("Offsets")
+
+    df = pd.DataFrame(colunas)
+    df["InicioMovimentos"] = offsets[:-1]
+    df["TamanhoSolucao"] = np.diff(offsets)
+    df.attrs["movimentos"] = movimentos.tobytes()
+    return df
+
+
+def movimentos_codificados(df):
+    """
+    Códigos de movimento de todas as linhas (array uint8 sobre os bytes de
+    df.attrs["movimentos"], sem cópia). Os attrs guardam bytes porque o
+    pandas compara attrs ao combinar DataFrames (groupby, concat), e um
+    array NumPy não tem valor lógico único.
+    """
+    return np.frombuffer(df.attrs["movimentos"], dtype=np.uint8)
+
+
+def listas_de_direcoes(df):
+    """Reconstrói as listas de nomes de direção (para código que ainda as usa)."""
+    nomes = [DIRECOES[c] for c in movimentos_codificados(df).tolist()]
+    return [nomes[inicio:inicio + tamanho]
+            for inicio, tamanho in zip(df["InicioMovimentos"].tolist(), df["TamanhoSolucao"].tolist())]
+
+
+def anexar_movimentos(df, listas):
+    """
+    Codifica listas de nomes de direção (uma por linha de df) no mesmo layout
+    do formato colunar: df.attrs["movimentos"], InicioMovimentos e
+    TamanhoSolucao.
+    """
+    sequencias = [codificar_direcoes(direcoes) for direcoes in listas]
+    tamanhos = np.fromiter(map(len, sequencias), dtype=np.int64, count=len(sequencias))
+    df["InicioMovimentos"] = np.cumsum(tamanhos) - tamanhos
+    df["TamanhoSolucao"] = tamanhos
+    df.attrs["movimentos"] = b"".join(sequencias)
+
+
+def sem_acertos_cache(df):
+    """
+    Remove as linhas respondidas pelo cache de soluções (Cache == "acerto"):
+    elas têm Expanded = 0 e tempo quase nulo, então distorceriam médias e
+    gráficos de desempenho. As contagens de acertos ficam nas colunas do
+    resumo do benchmark.
+    """
+    if "Cache" not in df.columns:
+        return df
+    acertos = (df["Cache"] == "acerto").to_numpy()
+    if not acertos.any():
+        return df
+    print(f"Ignorando {int(acertos.sum())} linhas respondidas pelo cache de soluções.")
+    filtrado = df[~acertos].reset_index(drop=True)
+    filtrado.attrs = df.attrs
+    return filtrado
+
+
+def memoria_por_job(df, medida="consumo"):
+    """
+    Memória de cada linha em MB: o pico medido por job (MemPicoMB) quando
+    existir; senão, com `medida` "consumo", MemMBFim - MemMBInicio e, com
+    "pico", o maior dos dois. None se o DataFrame não tiver essas colunas.
+    """
+    if "MemPicoMB" in df.columns and df["MemPicoMB"].notna().any():
+        return df["MemPicoMB"]
+    if "MemMBFim" not in df.columns or "MemMBInicio" not in df.columns:
+        return None
+    if medida == "pico":
+        return df[["MemMBInicio", "MemMBFim"]].max(axis=1)
+    return df["MemMBFim"] - df["MemMBInicio"]
+
+
+def algoritmos_presentes(df):
+    """
+    Algoritmos que aparecem em `df`, na ordem de ORDEM_ALGORITMOS; nomes
+    fora dela (de resultados antigos ou novos) vão para o fim, em ordem
+    alfabética, em vez de sumirem dos gráficos.
+    """
+    nomes = set(df["Algorithm"].unique())
+    return ([algo for algo in ORDEM_ALGORITMOS if algo in nomes]
+            + sorted(nomes.difference(ORDEM_ALGORITMOS)))
+
+
+def cores_algoritmos(algoritmos):
+    """Lista de cores (CORES_ALGORITMOS, cinza se desconhecido) para uma lista de algoritmos."""
+    return [CORES_ALGORITMOS.get(algo, "gray") for algo in algoritmos]
+
+
+# =========================
+# Estatísticas vetorizadas de movimentos
+# =========================
+
+def indices_movimentos(df):
+    """
+    Achata os movimentos das linhas de df. Retorna (códigos, linha de cada
+    movimento em 0..len(df)-1, posição do movimento no caminho).
+    """
+    tamanhos = df["TamanhoSolucao"].to_numpy()
+    linha = np.repeat(np.arange(len(df)), tamanhos)
+    inicio_local = np.cumsum(tamanhos) - tamanhos
+    posicao = np.arange(tamanhos.sum()) - inicio_local[linha]
+    codigos = movimentos_codificados(df)[df["InicioMovimentos"].to_numpy()[linha] + posicao]
+    return codigos, linha, posicao
+
+
+def frequencia_movimentos(df, grupos="Algorithm"):
+    """Contagem de cada direção por grupo (linhas) via um único bincount."""
+    codigos, linha, _ = indices_movimentos(df)
+    grupo, rotulos = pd.factorize(df[grupos])
+    contagem = np.bincount(grupo[linha] * 4 + codigos, minlength=4 * len(rotulos))
+    return pd.DataFrame(contagem.reshape(-1, 4), index=rotulos, columns=DIRECOES)
+
+
+def distribuicao_tamanhos(df, grupos="Algorithm"):
+    """Histograma do tamanho das soluções por grupo (colunas = número de passos)."""
+    tamanhos = df["TamanhoSolucao"].to_numpy()
+    grupo, rotulos = pd.factorize(df[grupos])
+    largura = int(tamanhos.max()) + 1 if tamanhos.size else 1
+    contagem = np.bincount(grupo * largura + tamanhos, minlength=largura * len(rotulos))
+    return pd.DataFrame(contagem.reshape(-1, largura), index=rotulos)
+
+
+def movimentos_por_posicao(df):
+    """Contagem de cada direção por posição no caminho (linha i = i-ésimo movimento)."""
+    codigos, _, posicao = indices_movimentos(df)
+    comprimento = int(posicao.max()) + 1 if posicao.size else 0
+    contagem = np.bincount(posicao * 4 + codigos, minlength=4 * comprimento)
+    return pd.DataFrame(contagem.reshape(-1, 4), columns=DIRECOES)
+
+
+def converter_csv(caminho_csv, caminho_npz=None):
+    """Converte um CSV de resultados (ignorando o resumo do final) para .npz."""
+    linhas = []
+    with open(caminho_csv, "r", newline="", encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            if not (row.get("Iteration") or "").isdigit():
+                break
+            linhas.append(row)
+    if caminho_npz is None:
+        caminho_npz = re.sub(r"\.csv$", "", caminho_csv) + ".npz"
+    gravar_resultados_colunares(linhas, caminho_npz)
+    return caminho_npz
+
+
+if __name__ == "__main__":
+    print(converter_csv(*sys.argv[1:3]))
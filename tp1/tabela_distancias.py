@@ -0,0 +1,169 @@
+"""
+Tabela de distâncias a partir do objetivo para embaralhamentos rasos.
+
+Uma BFS retrógrada por camadas, vetorizada em NumPy, parte de `objetivo` e
+visita todos os estados a até `profundidade` movimentos. Para cada estado a
+tabela guarda o código compacto (uint64, como em tp1_completo), a distância
+ótima até o objetivo e o melhor movimento do vazio (código na ordem de
+`movimentos`: 0=cima, 1=baixo, 2=esquerda, 3=direita). Os três arrays ficam
+ordenados pelo código, então uma consulta é uma busca binária.
+
+Com a tabela, qualquer tabuleiro dentro do raio é resolvido descendo
+movimento a movimento até o objetivo, e é possível sortear tabuleiros a uma
+distância ótima exata (gerar_estado_inicial_soluvel só controla o número de
+movimentos aleatórios, não a distância).
+
+Uso offline:
+    python tabela_distancias.py 20
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from tp1_completo import (objetivo, movimentos, tabuleiro_para_estado, estado_para_compacto,
+                          compacto_para_estado, estado_para_tabuleiro)
+
+PASTA_TABELA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabela_distancias")
+
+# Estados por distância ótima: 1, 2, 4, 10, 24, ..., 1.6 milhão na camada 20;
+# até a profundidade 20 a tabela tem cerca de 3,5 milhões de estados (35 MB).
+
+_QUATRO = np.uint64(4)
+_NIBBLE = np.uint64(0xF)
+
+
+def _vizinhos(codigos, vazios):
+    """
+    Gera, de forma vetorizada, os vizinhos de um lote de estados. Retorna
+    (códigos, posições do vazio, movimento que leva o vizinho de volta).
+    """
+    linha, coluna = vazios // 4, vazios % 4
+    novos, novos_vazios, retornos = [], [], []
+    for codigo_movimento, (dl, dc) in enumerate(movimentos):
+        validos = (linha + dl >= 0) & (linha + dl < 4) & (coluna + dc >= 0) & (coluna + dc < 4)
+        codigo, vazio = codigos[validos], vazios[validos]
+        alvo = vazio + (4 * dl + dc)
+        desloc_alvo = alvo.astype(np.uint64) * _QUATRO
+        desloc_vazio = vazio.astype(np.uint64) * _QUATRO
+        peca = (codigo >> desloc_alvo) & _NIBBLE
+        novos.append(codigo - (peca << desloc_alvo) + (peca << desloc_vazio))
+        novos_vazios.append(alvo)
+        # cima <-> baixo e esquerda <-> direita: o movimento oposto troca o bit 0
+        retornos.append(np.full(codigo.size, codigo_movimento ^ 1, dtype=np.uint8))
+    return np.concatenate(novos), np.concatenate(novos_vazios), np.concatenate(retornos)
+
+
+def _contidos(valores, ordenados):
+    """Máscara dos `valores` presentes no array `ordenados`."""
+    if not ordenados.size:
+        return np.zeros(valores.size, dtype=bool)
+    posicoes = np.searchsorted(ordenados, valores).clip(max=ordenados.size - 1)
+    return ordenados[posicoes] == valores
+
+
+def construir_tabela(profundidade):
+    """
+    BFS retrógrada por camadas até `profundidade`. Retorna (códigos,
+    distâncias, movimentos) ordenados pelo código. Como o grafo do puzzle é
+    bipartido, os vizinhos da camada d só podem estar nas camadas d-1 e d+1,
+    então basta descartar os que já estão na camada anterior.
+    """
+    meta = tabuleiro_para_estado(objetivo)
+    camada = np.array([estado_para_compacto(meta)], dtype=np.uint64)
+    vazios = np.array([meta.index(0)], dtype=np.int64)
+    anterior = np.empty(0, dtype=np.uint64)
+    codigos, distancias, melhores = [camada], [np.zeros(1, dtype=np.uint8)], [np.zeros(1, dtype=np.uint8)]
+
+    for distancia in range(1, profundidade + 1):
+        novos, novos_vazios, retornos = _vizinhos(camada, vazios)
+        novos, indices = np.unique(novos, return_index=True)
+        novos_vazios, retornos = novos_vazios[indices], retornos[indices]
+        manter = ~_contidos(novos, anterior)
+        anterior = camada
+        camada, vazios = novos[manter], novos_vazios[manter]
+        codigos.append(camada)
+        distancias.append(np.full(camada.size, distancia, dtype=np.uint8))
+        melhores.append(retornos[manter])
+
+    codigos = np.concatenate(codigos)
+    ordem = np.argsort(codigos)
+    return codigos[ordem], np.concatenate(distancias)[ordem], np.concatenate(melhores)[ordem]
+
+
+def _arquivos(profundidade, pasta):
+    return [os.path.join(pasta, f"{nome}-{profundidade}.npy")
+            for nome in ("codigos", "distancias", "movimentos")]
+
+
+def salvar_tabela(profundidade, pasta=PASTA_TABELA):
+    """Constrói e salva em disco a tabela de uma profundidade."""
+    os.makedirs(pasta, exist_ok=True)
+    inicio = time.time()
+    arrays = construir_tabela(profundidade)
+    for arquivo, array in zip(_arquivos(profundidade, pasta), arrays):
+        np.save(arquivo, array)
+    print(f"Profundidade {profundidade}: {arrays[0].size} estados, "
+          f"{sum(a.nbytes for a in arrays)} bytes, {time.time() - inicio:.1f}s")
+
+
+class TabelaDistancias:
+    """Consulta, resolução por descida e amostragem sobre uma tabela construída."""
+
+    def __init__(self, codigos, distancias, melhores):
+        self.codigos = codigos
+        self.distancias = distancias
+        self.melhores = melhores
+        self.profundidade = int(distancias.max()) if distancias.size else 0
+
+    def indice(self, codigo):
+        """Posição do código na tabela, ou -1 se estiver fora do raio."""
+        i = int(np.searchsorted(self.codigos, np.uint64(codigo)))
+        if i < self.codigos.size and int(self.codigos[i]) == codigo:
+            return i
+        return -1
+
+    def distancia(self, estado):
+        """Distância ótima de um estado (tupla 1D) até o objetivo, ou None."""
+        i = self.indice(estado_para_compacto(estado))
+        return int(self.distancias[i]) if i >= 0 else None
+
+    def resolver(self, estado):
+        """
+        Caminho ótimo (lista de estados, sem o inicial, como nas buscas)
+        seguindo o melhor movimento de cada estado, ou None fora do raio.
+        """
+        codigo = estado_para_compacto(estado)
+        i = self.indice(codigo)
+        if i < 0:
+            return None
+        vazio = estado.index(0)
+        caminho = []
+        for _ in range(int(self.distancias[i])):
+            dl, dc = movimentos[self.melhores[i]]
+            destino = vazio + 4 * dl + dc
+            peca = (codigo >> (4 * destino)) & 0xF
+            codigo = codigo - (peca << (4 * destino)) + (peca << (4 * vazio))
+            vazio = destino
+            caminho.append(compacto_para_estado(codigo))
+            i = self.indice(codigo)
+        return caminho
+
+    def amostrar(self, distancia, quantidade=1, rng=None):
+        """Sorteia `quantidade` tabuleiros (4x4) a exatamente `distancia` movimentos do objetivo."""
+        if not 0 <= distancia <= self.profundidade:
+            raise ValueError(f"distância {distancia} fora da tabela (0 a {self.profundidade})")
+        rng = np.random.default_rng() if rng is None else rng
+        candidatos = np.flatnonzero(self.distancias == distancia)
+        escolhidos = self.codigos[rng.choice(candidatos, size=quantidade)]
+        return [estado_para_tabuleiro(compacto_para_estado(int(c))) for c in escolhidos]
+
+
+def carregar_tabela(profundidade, pasta=PASTA_TABELA):
+    """Carrega (via memory mapping) uma tabela já salva."""
+    return TabelaDistancias(*(np.load(arquivo, mmap_mode="r")
+                              for arquivo in _arquivos(profundidade, pasta)))
+
+
+if __name__ == "__main__":
+    salvar_tabela(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
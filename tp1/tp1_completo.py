@@ -8,11 +8,14 @@ Original file is located at
 """
 
 import random
+import sys
 import copy
 from collections import deque
 import time
 import heapq
 import time
+from array import array
+from fractions import Fraction
 
 
 # =========================
@@ -177,59 +180,468 @@ def mover_estado(estado, direcao):
         return tuple(novo)
     return None
 
+# =========================
+# Representação Compacta (inteiro de 64 bits)
+# =========================
+# Cada peça ocupa 4 bits: a posição p do tabuleiro fica nos bits 4*p até 4*p+3.
+# A posição do vazio é carregada junto do código durante as buscas, então
+# nenhum sucessor precisa procurar o 0 novamente.
+
+DESLOCAMENTOS = tuple(4 * p for p in range(16))
+MASCARAS = tuple(0xF << (4 * p) for p in range(16))
+
+# Para cada posição do vazio, as posições com as quais ele pode trocar
+# (na ordem cima, baixo, esquerda, direita).
+TROCAS_VAZIO = tuple(
+    tuple(ni * 4 + nj
+          for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+          if 0 <= ni < 4 and 0 <= nj < 4)
+    for i, j in (divmod(p, 4) for p in range(16))
+)
+
+# A mesma tabela já com o deslocamento de bits de cada destino: (destino, 4*destino)
+VIZINHOS_VAZIO = tuple(
+    tuple((destino, DESLOCAMENTOS[destino]) for destino in trocas)
+    for trocas in TROCAS_VAZIO
+)
+
+# Deslocamento do índice do vazio -> código do movimento (0=cima, 1=baixo,
+# 2=esquerda, 3=direita, como em `movimentos`)
+MOVIMENTO_POR_DIFERENCA = {-4: 0, 4: 1, -1: 2, 1: 3}
+
+# Com o código do movimento do vazio: (destino, 4*destino, movimento). Usada
+# pelas buscas em profundidade para consultar o autômato de poda.
+PASSOS_VAZIO = tuple(
+    tuple((destino, DESLOCAMENTOS[destino], MOVIMENTO_POR_DIFERENCA[destino - vazio])
+          for destino in trocas)
+    for vazio, trocas in enumerate(TROCAS_VAZIO)
+)
+
+# Autômato de poda no formato de automato_poda.py: para cada estado, o
+# próximo estado de cada movimento, ou -1 se o movimento deve ser podado.
+# Este é o mínimo: o estado 0 é o inicial e o estado m+1 lembra o último
+# movimento m, proibindo só o inverso (m ^ 1, que desfaz o anterior).
+AUTOMATO_INVERSO = ((1, 2, 3, 4),) + tuple(
+    tuple(-1 if movimento == ultimo ^ 1 else movimento + 1 for movimento in range(4))
+    for ultimo in range(4)
+)
+
+def estado_para_compacto(estado):
+    """Converte um estado (tupla 1D) para o código inteiro de 64 bits."""
+    codigo = 0
+    for desloc, valor in zip(DESLOCAMENTOS, estado):
+        codigo |= valor << desloc
+    return codigo
+
+def compacto_para_estado(codigo):
+    """Converte um código inteiro de volta para o estado (tupla 1D)."""
+    return tuple((codigo >> desloc) & 0xF for desloc in DESLOCAMENTOS)
+
+def tabuleiro_para_compacto(tabuleiro):
+    """Converte o tabuleiro 2D diretamente para o código inteiro."""
+    return estado_para_compacto(tabuleiro_para_estado(tabuleiro))
+
+def compacto_para_tabuleiro(codigo):
+    """Converte o código inteiro diretamente para matriz 4x4."""
+    return estado_para_tabuleiro(compacto_para_estado(codigo))
+
+def vazio_compacto(codigo):
+    """Retorna a posição (0-15) do espaço vazio em um código."""
+    for p, mascara in enumerate(MASCARAS):
+        if not codigo & mascara:
+            return p
+
+def mover_compacto(codigo, vazio, destino):
+    """Troca o vazio com a peça em `destino` e retorna o novo código."""
+    peca = (codigo >> DESLOCAMENTOS[destino]) & 0xF
+    return codigo - (peca << DESLOCAMENTOS[destino]) + (peca << DESLOCAMENTOS[vazio])
+
+def sucessores_compactos(codigo, vazio, anterior=-1):
+    """
+    Retorna a lista de (novo_codigo, nova_posicao_vazio) a partir de um código.
+    `anterior` é a posição do vazio no estado pai: o movimento que volta
+    para ela (o inverso do último) não é gerado.
+    """
+    sucessores = []
+    desloc_vazio = DESLOCAMENTOS[vazio]
+    for destino, desloc in VIZINHOS_VAZIO[vazio]:
+        if destino == anterior:
+            continue
+        peca = (codigo >> desloc) & 0xF
+        sucessores.append((codigo - (peca << desloc) + (peca << desloc_vazio), destino))
+    return sucessores
+
+def reconstruir_caminho(pais, codigo_final):
+    """
+    Reconstrói o caminho (lista de estados, sem o inicial) seguindo o mapa
+    de predecessores a partir do código final até a raiz (pai None).
+    """
+    caminho = []
+    codigo = codigo_final
+    while pais[codigo] is not None:
+        caminho.append(compacto_para_estado(codigo))
+        codigo = pais[codigo]
+    caminho.reverse()
+    return caminho
+
+def registrar_estruturas(estatisticas, pico_fronteira, pico_visitados):
+    """
+    Registra em `estatisticas` (se dado) o maior tamanho atingido pela
+    fronteira (fila/pilha/caminho) e pelo conjunto de visitados.
+    """
+    if estatisticas is not None:
+        estatisticas["pico_fronteira"] = pico_fronteira
+        estatisticas["pico_visitados"] = pico_visitados
+
+# =========================
+# Orçamento de busca
+# =========================
+
+# Resultados possíveis de uma busca, registrados em estatisticas["resultado"]
+ENCONTRADO = "encontrado"
+SEM_SOLUCAO = "sem_solucao"
+ORCAMENTO_ESGOTADO = "orcamento_esgotado"
+
+class Orcamento:
+    """
+    Limites de expansões, tempo de relógio (s) e memória (MB acima do RSS no
+    início da busca). As buscas chamam iniciar() ao começar e esgotado()
+    apenas quando nos_expandidos alcança proxima_verificacao(), então o custo
+    no laço principal é uma comparação de inteiros por expansão. Com
+    `incluir_filhos`, a memória soma o RSS dos processos filhos (buscas que
+    distribuem o trabalho entre processos, como a_star_paralelo).
+    """
+    INTERVALO = 1024  # expansões entre verificações de tempo e memória
+
+    def __init__(self, max_expansoes=None, tempo_maximo=None, memoria_maxima_mb=None,
+                 incluir_filhos=False):
+        self.max_expansoes = max_expansoes
+        self.tempo_maximo = tempo_maximo
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self.incluir_filhos = incluir_filhos
+        self.motivo = None
+
+    def iniciar(self):
+        self.motivo = None
+        self.inicio = time.perf_counter()
+        self.memoria_inicial = (_rss_mb(self.incluir_filhos)
+                                if self.memoria_maxima_mb is not None else 0)
+        return self.proxima_verificacao(0)
+
+    def proxima_verificacao(self, nos_expandidos):
+        """Contagem de expansões em que esgotado() deve ser chamado de novo."""
+        proxima = nos_expandidos + self.INTERVALO
+        if self.max_expansoes is not None and self.max_expansoes < proxima:
+            proxima = max(self.max_expansoes, nos_expandidos)
+        return proxima
+
+    def esgotado(self, nos_expandidos):
+        """Verifica os limites; guarda em `motivo` qual deles foi atingido."""
+        if self.max_expansoes is not None and nos_expandidos >= self.max_expansoes:
+            self.motivo = "expansoes"
+        elif self.tempo_maximo is not None and time.perf_counter() - self.inicio >= self.tempo_maximo:
+            self.motivo = "tempo"
+        elif (self.memoria_maxima_mb is not None
+              and _rss_mb(self.incluir_filhos) - self.memoria_inicial >= self.memoria_maxima_mb):
+            self.motivo = "memoria"
+        return self.motivo is not None
+
+def pico_rss_mb(processo=None):
+    """
+    Maior RSS (MB) já atingido pelo processo atual. No Windows, sem o módulo
+    resource, usa o peak_wset do psutil (`processo` ou o processo atual).
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+        return (processo or psutil.Process()).memory_info().peak_wset / (1024 * 1024)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KB no Linux
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def _rss_mb(incluir_filhos=False):
+    """
+    RSS atual do processo em MB, somado ao dos filhos se `incluir_filhos`.
+    Sem psutil, usa o pico do próprio processo (os filhos não entram).
+    """
+    try:
+        import psutil
+    except ImportError:
+        return pico_rss_mb()
+    processo = psutil.Process()
+    rss = processo.memory_info().rss
+    if incluir_filhos:
+        for filho in processo.children(recursive=True):
+            try:
+                rss += filho.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+    return rss / (1024 * 1024)
+
+def iniciar_orcamento(orcamento):
+    """Primeira contagem de verificação (infinita quando não há orçamento)."""
+    return orcamento.iniciar() if orcamento is not None else float('inf')
+
+def registrar_resultado(estatisticas, caminho, orcamento):
+    """
+    Registra em `estatisticas` (se dado) o resultado da busca: encontrado,
+    sem solução ou orçamento esgotado (com o limite atingido).
+    """
+    if estatisticas is None:
+        return
+    if caminho is not None:
+        estatisticas["resultado"] = ENCONTRADO
+    elif orcamento is not None and orcamento.motivo is not None:
+        estatisticas["resultado"] = ORCAMENTO_ESGOTADO
+        estatisticas["motivo_orcamento"] = orcamento.motivo
+    else:
+        estatisticas["resultado"] = SEM_SOLUCAO
+
+# =========================
+# Tabela de transposição
+# =========================
+
+POLITICAS_SUBSTITUICAO = ("profundidade", "sempre")
+
+class TabelaTransposicao:
+    """
+    Tabela de tamanho fixo, indexada pelo código compacto, que guarda a menor
+    profundidade g em que cada estado foi visto na geração atual (um limite
+    do IDDFS ou do IDA*). Um estado que reaparece com g maior ou igual já teve
+    sua subárvore explorada e pode ser podado. Cada posição ocupa 13 bytes
+    (código, g e geração em arrays), então a memória é fixa desde o início.
+
+    Numa colisão, a política "profundidade" mantém a entrada mais rasa (que
+    poupa uma subárvore maior) e "sempre" substitui pela mais recente. Não
+    combine com um autômato de poda maior que AUTOMATO_INVERSO: a primeira
+    visita pode ter podado movimentos que a segunda precisaria.
+    """
+
+    def __init__(self, capacidade=1_000_003, politica="profundidade"):
+        if politica not in POLITICAS_SUBSTITUICAO:
+            raise ValueError(f"política desconhecida: {politica}")
+        self.capacidade = capacidade
+        self.politica = politica
+        self.chaves = array("Q", bytes(8 * capacidade))
+        self.profundidades = array("B", bytes(capacidade))
+        self.geracoes = array("I", bytes(4 * capacidade))
+        self.geracao = 0
+        self.ocupadas = 0
+        self.consultas = 0
+        self.acertos = 0
+        self.substituicoes = 0
+
+    def nova_geracao(self):
+        """Invalida as entradas atuais (chamado a cada novo limite)."""
+        self.geracao += 1
+
+    def podar(self, codigo, g):
+        """
+        Consulta o estado e registra a visita. True se ele já foi visto nesta
+        geração com profundidade menor ou igual a `g`.
+        """
+        i = codigo % self.capacidade
+        self.consultas += 1
+        atual = self.geracoes[i] == self.geracao
+        if self.chaves[i] == codigo and atual:
+            if self.profundidades[i] <= g:
+                self.acertos += 1
+                return True
+            self.profundidades[i] = g
+            return False
+        if not self.chaves[i]:
+            self.ocupadas += 1
+        elif atual:
+            if self.politica == "profundidade" and self.profundidades[i] < g:
+                return False
+            self.substituicoes += 1
+        self.chaves[i] = codigo
+        self.profundidades[i] = g
+        self.geracoes[i] = self.geracao
+        return False
+
+    @property
+    def taxa_acertos(self):
+        return self.acertos / self.consultas if self.consultas else 0.0
+
+    @property
+    def tamanho_bytes(self):
+        return self.capacidade * 13
+
+def registrar_tabela(estatisticas, tabela):
+    """Registra em `estatisticas` (se dado) consultas, acertos e ocupação da tabela."""
+    if estatisticas is not None and tabela is not None:
+        estatisticas["consultas_tabela"] = tabela.consultas
+        estatisticas["acertos_tabela"] = tabela.acertos
+        estatisticas["taxa_acertos_tabela"] = tabela.taxa_acertos
+        estatisticas["substituicoes_tabela"] = tabela.substituicoes
+        estatisticas["pico_visitados"] = tabela.ocupadas
+
 # =====================
 # BFS (Busca em Largura)
 # =====================
 
-def bfs(inicial, objetivo):
+def bfs(inicial, objetivo, estatisticas=None, orcamento=None):
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
     fila = deque()
-    fila.append((inicial, []))
-    visitados = set()
-    visitados.add(inicial)
+    fila.append((codigo_inicial, inicial.index(0), -1))  # (código, vazio, vazio do pai)
+    pais = {codigo_inicial: None}  # também serve como conjunto de visitados
     nos_expandidos = 0
+    pico_fronteira = 1
+    verificar_em = iniciar_orcamento(orcamento)
 
+    caminho = None
     while fila:
-        estado_atual, caminho = fila.popleft()
+        if nos_expandidos >= verificar_em:
+            if orcamento.esgotado(nos_expandidos):
+                break
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        codigo_atual, vazio, anterior = fila.popleft()
         nos_expandidos += 1
 
-        if estado_atual == objetivo:
-            return caminho, nos_expandidos
+        if codigo_atual == codigo_objetivo:
+            caminho = reconstruir_caminho(pais, codigo_atual)
+            break
 
-        i, j = encontrar_zero(estado_atual)
-        for direcao in movimentos_validos(i, j):
-            novo_estado = mover_estado(estado_atual, direcao)
-            if novo_estado and novo_estado not in visitados:
-                visitados.add(novo_estado)
-                fila.append((novo_estado, caminho + [novo_estado]))
+        for novo_codigo, novo_vazio in sucessores_compactos(codigo_atual, vazio, anterior):
+            if novo_codigo not in pais:
+                pais[novo_codigo] = codigo_atual
+                fila.append((novo_codigo, novo_vazio, vazio))
+        if len(fila) > pico_fronteira:
+            pico_fronteira = len(fila)
 
-    return None, nos_expandidos
+    registrar_estruturas(estatisticas, pico_fronteira, len(pais))
+    registrar_resultado(estatisticas, caminho, orcamento)
+    return caminho, nos_expandidos
 
 # =====================
 # DFS (Busca em Profundidade)
 # =====================
 
-def dfs(inicial, objetivo, profundidade_maxima):
-    pilha = [(inicial, [], 0)]  # (estado, caminho, profundidade)
-    visitados = set()
-    visitados.add(inicial)
+def dfs(inicial, objetivo, profundidade_maxima, estatisticas=None, orcamento=None, iterativo=True,
+        automato=None, tabela=None):
+    """
+    Busca em profundidade limitada a `profundidade_maxima`. Por padrão é
+    iterativa (IDDFS): repete a busca com limites 0, 1, 2, ... e só evita
+    ciclos no caminho atual (e o movimento que desfaz o anterior), então acha
+    a solução mais rasa dentro do limite usando memória O(profundidade).
+    Um `automato` de automato_poda.py poda também as sequências de movimentos
+    duplicadas; o total de filhos podados vai para estatisticas["podas_automato"].
+    Uma `tabela` (TabelaTransposicao) poda estados já vistos em profundidade
+    menor ou igual, com memória limitada à capacidade da tabela.
+    Com iterativo=False faz uma única busca até `profundidade_maxima`: com
+    `tabela`, ela substitui o conjunto de visitados; sem, usa a versão com
+    conjunto global de visitados, que pode perder soluções alcançáveis apenas
+    por estados já vistos.
+    """
+    if not iterativo and tabela is None:
+        return dfs_visitados(inicial, objetivo, profundidade_maxima, estatisticas, orcamento)
+
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    transicoes = AUTOMATO_INVERSO if automato is None else automato
+    caminho = []
+    no_caminho = {codigo_inicial}  # estados do caminho atual (detecção de ciclos)
+    nos_expandidos = 0
+    podas = 0
+    pico_profundidade = 0
+    verificar_em = iniciar_orcamento(orcamento)
+    interrompida = cortada = False
+
+    def buscar(codigo, vazio, estado_automato, g, limite):
+        nonlocal nos_expandidos, podas, pico_profundidade, verificar_em, interrompida, cortada
+        if tabela is not None and tabela.podar(codigo, g):
+            return False
+        if nos_expandidos >= verificar_em:
+            if orcamento.esgotado(nos_expandidos):
+                interrompida = True
+                return False
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        nos_expandidos += 1
+        if g > pico_profundidade:
+            pico_profundidade = g
+        if codigo == codigo_objetivo:
+            return True
+        if g == limite:
+            cortada = True
+            return False
+
+        desloc_vazio = DESLOCAMENTOS[vazio]
+        proximos = transicoes[estado_automato]
+        for destino, desloc, movimento in PASSOS_VAZIO[vazio]:
+            proximo = proximos[movimento]
+            if proximo < 0:  # sequência duplicada (no mínimo, desfaz o último movimento)
+                podas += 1
+                continue
+            peca = (codigo >> desloc) & 0xF
+            novo_codigo = codigo - (peca << desloc) + (peca << desloc_vazio)
+            if novo_codigo in no_caminho:
+                continue
+            caminho.append(novo_codigo)
+            no_caminho.add(novo_codigo)
+            if buscar(novo_codigo, destino, proximo, g + 1, limite):
+                return True
+            if interrompida:
+                return False
+            caminho.pop()
+            no_caminho.discard(novo_codigo)
+        return False
+
+    encontrado = False
+    limites = range(profundidade_maxima + 1) if iterativo else (profundidade_maxima,)
+    for limite in limites:
+        cortada = False
+        if tabela is not None:
+            tabela.nova_geracao()
+        encontrado = buscar(codigo_inicial, inicial.index(0), 0, 0, limite)
+        # Sem nenhum corte pelo limite, aprofundar não encontraria mais nada
+        if encontrado or interrompida or not cortada:
+            break
+
+    registrar_estruturas(estatisticas, pico_profundidade, pico_profundidade + 1)
+    registrar_tabela(estatisticas, tabela)
+    if estatisticas is not None:
+        estatisticas["podas_automato"] = podas
+    solucao = [compacto_para_estado(c) for c in caminho] if encontrado else None
+    registrar_resultado(estatisticas, solucao, orcamento)
+    return solucao, nos_expandidos
+
+def dfs_visitados(inicial, objetivo, profundidade_maxima, estatisticas=None, orcamento=None):
+    """DFS limitada com conjunto global de visitados (versão anterior ao IDDFS)."""
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    pilha = [(codigo_inicial, inicial.index(0), -1, 0)]  # (código, vazio, vazio do pai, profundidade)
+    pais = {codigo_inicial: None}  # também serve como conjunto de visitados
     nos_expandidos = 0
+    pico_fronteira = 1
+    verificar_em = iniciar_orcamento(orcamento)
 
+    caminho = None
     while pilha:
-        estado_atual, caminho, profundidade = pilha.pop()
+        if nos_expandidos >= verificar_em:
+            if orcamento.esgotado(nos_expandidos):
+                break
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        codigo_atual, vazio, anterior, profundidade = pilha.pop()
         nos_expandidos += 1
 
-        if estado_atual == objetivo:
-            return caminho, nos_expandidos
+        if codigo_atual == codigo_objetivo:
+            caminho = reconstruir_caminho(pais, codigo_atual)
+            break
 
         if profundidade < profundidade_maxima:
-            i, j = encontrar_zero(estado_atual)
-            for direcao in movimentos_validos(i, j):
-                novo_estado = mover_estado(estado_atual, direcao)
-                if novo_estado and novo_estado not in visitados:
-                    visitados.add(novo_estado)
-                    pilha.append((novo_estado, caminho + [novo_estado], profundidade + 1))
+            for novo_codigo, novo_vazio in sucessores_compactos(codigo_atual, vazio, anterior):
+                if novo_codigo not in pais:
+                    pais[novo_codigo] = codigo_atual
+                    pilha.append((novo_codigo, novo_vazio, vazio, profundidade + 1))
+            if len(pilha) > pico_fronteira:
+                pico_fronteira = len(pilha)
 
-    return None, nos_expandidos
+    registrar_estruturas(estatisticas, pico_fronteira, len(pais))
+    registrar_resultado(estatisticas, caminho, orcamento)
+    return caminho, nos_expandidos
 
 # =========================
 # TESTE
@@ -272,36 +684,563 @@ def distancia_manhattan(estado):
             distancia += abs(linha_atual - linha_objetivo) + abs(coluna_atual - coluna_objetivo)
     return distancia
 
+# Tabela peça x posição com a distância de Manhattan da peça até seu lugar
+# no objetivo (linha 0, do vazio, é toda zero). Um movimento altera a
+# distância de uma única peça em exatamente +1 ou -1.
+DISTANCIA_MANHATTAN = tuple(
+    tuple(0 if peca == 0 else
+          abs(pos // 4 - (peca - 1) // 4) + abs(pos % 4 - (peca - 1) % 4)
+          for pos in range(16))
+    for peca in range(16)
+)
+
+def distancia_manhattan_compacta(codigo):
+    """Distância de Manhattan calculada diretamente sobre o código inteiro."""
+    distancia = 0
+    for idx, desloc in enumerate(DESLOCAMENTOS):
+        distancia += DISTANCIA_MANHATTAN[(codigo >> desloc) & 0xF][idx]
+    return distancia
+
 # =========================
 # Busca A* (A Estrela)
 # =========================
 
-def a_star(inicial, objetivo):
-    """Busca A* para resolver o 15-puzzle."""
-    fila = []
-    heapq.heappush(fila, (distancia_manhattan(inicial), 0, inicial, []))  # (f, g, estado, caminho)
-    visitados = set()
-    visitados.add(inicial)
+class FilaBaldes:
+    """
+    Fila de prioridade por baldes para chaves f inteiras e pequenas.
+    Cada balde f é dividido em sub-baldes por g: dentro do mesmo f sai
+    primeiro o maior g (mais perto do objetivo) e, no mesmo g, a ordem é
+    LIFO, o que torna o desempate determinístico. inserir/retirar são O(1)
+    amortizados, sem comparações de tuplas.
+    """
+
+    def __init__(self):
+        self.baldes = []  # baldes[f][g] -> lista de entradas
+        self.minimo = 0   # nenhum balde abaixo deste f tem entradas
+        self.tamanho = 0
+
+    def __len__(self):
+        return self.tamanho
+
+    def inserir(self, f, g, entrada):
+        baldes = self.baldes
+        while len(baldes) <= f:
+            baldes.append([])
+        balde = baldes[f]
+        while len(balde) <= g:
+            balde.append([])
+        balde[g].append(entrada)
+        if f < self.minimo:
+            self.minimo = f
+        self.tamanho += 1
+
+    def retirar(self, obsoleta=None):
+        """
+        Remove e retorna (f, g, entrada) com o menor f. Se `obsoleta(g, entrada)`
+        for dada, as entradas para as quais ela é verdadeira são descartadas
+        aqui mesmo (remoção preguiçosa). Retorna None se a fila esvaziar.
+        """
+        baldes = self.baldes
+        while self.tamanho:
+            balde = baldes[self.minimo]
+            if not balde:
+                self.minimo += 1
+                continue
+            g = len(balde) - 1
+            entrada = balde[g].pop()
+            while balde and not balde[-1]:
+                balde.pop()
+            self.tamanho -= 1
+            if obsoleta is None or not obsoleta(g, entrada):
+                return self.minimo, g, entrada
+        return None
+
+    def reordenar(self, chave):
+        """
+        Recoloca todas as entradas com a nova prioridade chave(g, entrada);
+        as entradas para as quais ela retorna None são descartadas.
+        """
+        baldes = self.baldes
+        self.baldes, self.minimo, self.tamanho = [], 0, 0
+        for balde in baldes:
+            for g, entradas in enumerate(balde):
+                for entrada in entradas:
+                    f = chave(g, entrada)
+                    if f is not None:
+                        self.inserir(f, g, entrada)
+
+def a_star(inicial, objetivo, heuristica=None, reabrir=True, estatisticas=None, orcamento=None,
+           peso=1, anytime=False, ao_melhorar=None, decremento_peso=0.5):
+    """
+    Busca A* com Manhattan incremental ou `heuristica(codigo)`. Mantém a
+    melhor g de cada estado e reabre estados fechados se `reabrir`. Com
+    `peso` w > 1 ordena por g + w·h (custo até w vezes o ótimo). Contadores
+    vão para `estatisticas`; `orcamento` limita a busca. Modo `anytime`: ver
+    a_star_anytime.
+    """
+    if anytime and decremento_peso <= 0:
+        raise ValueError(f"decremento_peso deve ser positivo: {decremento_peso}")
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    fila = FilaBaldes()
+    # Os baldes precisam de f inteiro: com w = num/den, o balde é g·den + num·h
+    num, den = Fraction(peso).limit_denominator(100).as_integer_ratio()
+    # Entradas (código, vazio, h, vazio do pai) nos baldes (f, g) - a heurística
+    # viaja com a entrada e é atualizada em O(1) pela tabela DISTANCIA_MANHATTAN;
+    # o vazio do pai evita gerar o movimento inverso (que nunca melhora g).
+    if heuristica is None:
+        h_inicial = distancia_manhattan_compacta(codigo_inicial)
+    else:
+        h_inicial = heuristica(codigo_inicial)
+    fila.inserir(num * h_inicial, 0, (codigo_inicial, inicial.index(0), h_inicial, -1))
+    pais = {codigo_inicial: None}
+    melhor_g = {codigo_inicial: 0}
+    fechados = set()
     nos_expandidos = 0
+    duplicados = obsoletos = reaberturas = 0
+    pico_fronteira = 1
+    custo_incumbente = float('inf')  # custo da melhor solução (modo anytime)
+    melhorias = []
+    otimo_provado = False
+    inicio = time.perf_counter()
+    verificar_em = iniciar_orcamento(orcamento)
+
+    def obsoleta(g, entrada):
+        nonlocal obsoletos
+        if g > melhor_g[entrada[0]]:
+            obsoletos += 1
+            return True
+        return False
 
+    caminho = None
     while fila:
-        f, g, estado_atual, caminho = heapq.heappop(fila)
+        if nos_expandidos >= verificar_em:
+            if orcamento.esgotado(nos_expandidos):
+                break
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        item = fila.retirar(obsoleta)
+        if item is None:
+            break
+        f, g, entrada = item
+        codigo_atual, vazio, h, anterior = entrada
+        if g + h >= custo_incumbente:
+            if num == den:
+                # Com w = 1 a fila sai em ordem de g + h: nada mais melhora a solução
+                otimo_provado = True
+                break
+            continue
+        if f >= custo_incumbente * den:
+            # Nenhum nó tem chave menor que a da solução: baixa o peso e reordena.
+            # Reordenar não expande nós, então o orçamento é conferido aqui também.
+            if orcamento is not None and orcamento.esgotado(nos_expandidos):
+                break
+            peso = max(1, peso - decremento_peso)
+            num, den = Fraction(peso).limit_denominator(100).as_integer_ratio()
+            fila.inserir(f, g, entrada)
+            fila.reordenar(lambda g, e: g * den + num * e[2]
+                           if g + e[2] < custo_incumbente and g <= melhor_g[e[0]] else None)
+            continue
         nos_expandidos += 1
 
-        if estado_atual == objetivo:
-            return caminho, nos_expandidos
+        if codigo_atual == codigo_objetivo:
+            caminho = reconstruir_caminho(pais, codigo_atual)
+            if not anytime:
+                break
+            custo_incumbente = g
+            segundos = time.perf_counter() - inicio
+            melhorias.append((g, segundos, nos_expandidos))
+            if ao_melhorar is not None:
+                ao_melhorar(g, segundos, nos_expandidos)
+            continue
+        fechados.add(codigo_atual)
+
+        desloc_vazio = DESLOCAMENTOS[vazio]
+        novo_g = g + 1
+        for destino, desloc in VIZINHOS_VAZIO[vazio]:
+            if destino == anterior:
+                continue
+            peca = (codigo_atual >> desloc) & 0xF
+            novo_codigo = codigo_atual - (peca << desloc) + (peca << desloc_vazio)
+            g_conhecido = melhor_g.get(novo_codigo)
+            if g_conhecido is not None and novo_g >= g_conhecido:
+                duplicados += 1
+                continue
+            if novo_codigo in fechados:
+                if not reabrir:
+                    duplicados += 1
+                    continue
+                fechados.discard(novo_codigo)
+                reaberturas += 1
+            melhor_g[novo_codigo] = novo_g
+            pais[novo_codigo] = codigo_atual
+            if heuristica is None:
+                distancias_peca = DISTANCIA_MANHATTAN[peca]
+                novo_h = h + distancias_peca[vazio] - distancias_peca[destino]
+            else:
+                novo_h = heuristica(novo_codigo)
+            if novo_g + novo_h >= custo_incumbente:
+                continue
+            fila.inserir(novo_g * den + num * novo_h, novo_g, (novo_codigo, destino, novo_h, vazio))
+        if len(fila) > pico_fronteira:
+            pico_fronteira = len(fila)
+
+    registrar_estruturas(estatisticas, pico_fronteira, len(melhor_g))
+    registrar_resultado(estatisticas, caminho, orcamento)
+    if estatisticas is not None:
+        estatisticas["duplicados_podados"] = duplicados
+        estatisticas["obsoletos_descartados"] = obsoletos
+        estatisticas["reaberturas"] = reaberturas
+        if anytime:
+            estatisticas["melhorias"] = melhorias
+            # Fila esgotada sem interrupção: nenhuma solução melhor existe
+            estatisticas["otimo_provado"] = caminho is not None and (otimo_provado or not fila)
+            estatisticas["peso_final"] = peso
+    return caminho, nos_expandidos
+
+def a_star_anytime(inicial, objetivo, peso=3, prazo=None, heuristica=None, estatisticas=None,
+                   orcamento=None, ao_melhorar=None, decremento=0.5):
+    """
+    A* anytime (como o ARA*): começa como A* ponderado (`peso`), que acha
+    uma primeira solução rapidamente, e não para nela. Guarda a melhor até
+    ali e descarta os nós com g + h maior ou igual ao seu custo. Quando
+    nenhum nó da fila tem chave menor que a da solução, w diminui
+    `decremento` (até 1) e a fila é reordenada. Com w = 1, a primeira chave
+    g + h que alcança o custo da solução prova que ela é ótima. Para antes
+    disso em `prazo` segundos (que substitui o tempo_maximo do `orcamento`),
+    retornando a melhor encontrada. Cada melhoria vai para
+    estatisticas["melhorias"] como (custo, segundos, nos_expandidos) e, se
+    dado, para ao_melhorar(custo, segundos, nos_expandidos).
+    """
+    if decremento <= 0:
+        raise ValueError(f"decremento deve ser positivo: {decremento}")
+    if prazo is not None:
+        limites = (None, None) if orcamento is None else (orcamento.max_expansoes,
+                                                            orcamento.memoria_maxima_mb)
+        orcamento = Orcamento(limites[0], prazo, limites[1])
+    return a_star(inicial, objetivo, heuristica=heuristica, estatisticas=estatisticas,
+                  orcamento=orcamento, peso=peso, anytime=True, ao_melhorar=ao_melhorar,
+                  decremento_peso=decremento)
+
+# =========================
+# Heurística: Conflito Linear
+# =========================
+# Duas peças na sua linha (ou coluna) objetivo, mas em ordem invertida, obrigam
+# uma delas a sair da linha e voltar: +2 movimentos sobre Manhattan. Por linha,
+# o número mínimo de peças a retirar é (peças na linha - maior subsequência
+# crescente), o que mantém a heurística admissível. Os valores são guardados
+# por conteúdo da linha/coluna (16 bits), então cada chave é calculada uma vez.
+
+_CONFLITOS_LINHA = [{} for _ in range(4)]
+_CONFLITOS_COLUNA = [{} for _ in range(4)]
+
+def _conflitos_sequencia(alvos):
+    """2 * (tamanho - maior subsequência crescente) de uma lista de posições alvo."""
+    if len(alvos) < 2:
+        return 0
+    maiores = [1] * len(alvos)
+    for i in range(1, len(alvos)):
+        for j in range(i):
+            if alvos[j] < alvos[i] and maiores[j] + 1 > maiores[i]:
+                maiores[i] = maiores[j] + 1
+    return 2 * (len(alvos) - max(maiores))
+
+def conflito_linha(codigo, linha):
+    """Penalidade de conflito linear da linha `linha` do código."""
+    chave = (codigo >> (16 * linha)) & 0xFFFF
+    cache = _CONFLITOS_LINHA[linha]
+    valor = cache.get(chave)
+    if valor is None:
+        pecas = [(chave >> (4 * coluna)) & 0xF for coluna in range(4)]
+        alvos = [(peca - 1) % 4 for peca in pecas if peca and (peca - 1) // 4 == linha]
+        valor = cache[chave] = _conflitos_sequencia(alvos)
+    return valor
+
+def conflito_coluna(codigo, coluna):
+    """Penalidade de conflito linear da coluna `coluna` do código."""
+    chave = 0
+    for linha in range(4):
+        chave |= ((codigo >> DESLOCAMENTOS[linha * 4 + coluna]) & 0xF) << (4 * linha)
+    cache = _CONFLITOS_COLUNA[coluna]
+    valor = cache.get(chave)
+    if valor is None:
+        pecas = [(chave >> (4 * linha)) & 0xF for linha in range(4)]
+        alvos = [(peca - 1) // 4 for peca in pecas if peca and (peca - 1) % 4 == coluna]
+        valor = cache[chave] = _conflitos_sequencia(alvos)
+    return valor
+
+def conflito_linear_compacto(codigo):
+    """Soma das penalidades de conflito linear de todas as linhas e colunas."""
+    return sum(conflito_linha(codigo, k) + conflito_coluna(codigo, k) for k in range(4))
+
+def variacao_conflito_linear(codigo, novo_codigo, vazio, destino):
+    """
+    Variação do conflito linear causada por um movimento. Um movimento vertical
+    só muda o conteúdo de duas linhas (a ordem nas colunas é preservada) e um
+    horizontal só muda duas colunas.
+    """
+    if vazio // 4 != destino // 4:
+        a, b = vazio // 4, destino // 4
+        return (conflito_linha(novo_codigo, a) + conflito_linha(novo_codigo, b)
+                - conflito_linha(codigo, a) - conflito_linha(codigo, b))
+    a, b = vazio % 4, destino % 4
+    return (conflito_coluna(novo_codigo, a) + conflito_coluna(novo_codigo, b)
+            - conflito_coluna(codigo, a) - conflito_coluna(codigo, b))
+
+def heuristica_conflito_linear(codigo):
+    """Manhattan + conflito linear de um código."""
+    return distancia_manhattan_compacta(codigo) + conflito_linear_compacto(codigo)
+
+# =========================
+# Busca IDA* (A* com Aprofundamento Iterativo)
+# =========================
 
-        i, j = encontrar_zero(estado_atual)
-        for direcao in movimentos_validos(i, j):
-            novo_estado = mover_estado(estado_atual, direcao)
-            if novo_estado and novo_estado not in visitados:
-                visitados.add(novo_estado)
-                novo_caminho = caminho + [novo_estado]
-                novo_g = g + 1
-                novo_f = novo_g + distancia_manhattan(novo_estado)
-                heapq.heappush(fila, (novo_f, novo_g, novo_estado, novo_caminho))
+def ida_star(inicial, objetivo, heuristica=None, estatisticas=None, orcamento=None, automato=None,
+             tabela=None):
+    """
+    IDA* para o 15-puzzle com heurística Manhattan + conflito linear.
+    Guarda apenas o caminho atual, então a memória é linear na profundidade
+    da solução. Retorna (caminho, nos_expandidos) como as demais buscas.
+    Uma `heuristica` h(codigo) alternativa pode ser passada; ela é
+    recalculada para cada filho. Em `estatisticas` o pico da fronteira é a
+    maior profundidade do caminho (não há conjunto de visitados). Um
+    `automato` de automato_poda.py poda as sequências de movimentos
+    duplicadas e uma `tabela` (TabelaTransposicao) poda estados já vistos
+    com g menor ou igual no mesmo limite, como em dfs.
+    """
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    transicoes = AUTOMATO_INVERSO if automato is None else automato
+    caminho = []
+    nos_expandidos = 0
+    podas = 0
+    pico_profundidade = 0
+    encontrado = -1
+    interrompido = -2
+    verificar_em = iniciar_orcamento(orcamento)
+
+    def buscar(codigo, vazio, estado_automato, g, h_manhattan, h_conflito, limite):
+        nonlocal nos_expandidos, podas, pico_profundidade, verificar_em
+        f = g + h_manhattan + h_conflito
+        if f > limite:
+            return f
+        if tabela is not None and tabela.podar(codigo, g):
+            return float('inf')
+        if nos_expandidos >= verificar_em:
+            if orcamento.esgotado(nos_expandidos):
+                return interrompido
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        nos_expandidos += 1
+        if g > pico_profundidade:
+            pico_profundidade = g
+        if codigo == codigo_objetivo:
+            return encontrado
+
+        minimo = float('inf')
+        desloc_vazio = DESLOCAMENTOS[vazio]
+        proximos = transicoes[estado_automato]
+        for destino, desloc, movimento in PASSOS_VAZIO[vazio]:
+            proximo = proximos[movimento]
+            if proximo < 0:  # sequência duplicada (no mínimo, desfaz o último movimento)
+                podas += 1
+                continue
+            peca = (codigo >> desloc) & 0xF
+            novo_codigo = codigo - (peca << desloc) + (peca << desloc_vazio)
+            if heuristica is None:
+                distancias_peca = DISTANCIA_MANHATTAN[peca]
+                novo_manhattan = h_manhattan + distancias_peca[vazio] - distancias_peca[destino]
+                novo_conflito = h_conflito + variacao_conflito_linear(codigo, novo_codigo, vazio, destino)
+            else:
+                novo_manhattan, novo_conflito = heuristica(novo_codigo), 0
+
+            caminho.append(novo_codigo)
+            t = buscar(novo_codigo, destino, proximo, g + 1, novo_manhattan, novo_conflito, limite)
+            if t == encontrado or t == interrompido:
+                return t
+            caminho.pop()
+            if t < minimo:
+                minimo = t
+        return minimo
+
+    if heuristica is None:
+        h_manhattan = distancia_manhattan_compacta(codigo_inicial)
+        h_conflito = conflito_linear_compacto(codigo_inicial)
+    else:
+        h_manhattan, h_conflito = heuristica(codigo_inicial), 0
+    limite = h_manhattan + h_conflito
+    while True:
+        if tabela is not None:
+            tabela.nova_geracao()
+        t = buscar(codigo_inicial, inicial.index(0), 0, 0, h_manhattan, h_conflito, limite)
+        if t == encontrado or t == interrompido or t == float('inf'):
+            break
+        limite = t
+
+    registrar_estruturas(estatisticas, pico_profundidade, 0)
+    registrar_tabela(estatisticas, tabela)
+    if estatisticas is not None:
+        estatisticas["podas_automato"] = podas
+    solucao = [compacto_para_estado(c) for c in caminho] if t == encontrado else None
+    registrar_resultado(estatisticas, solucao, orcamento)
+    return solucao, nos_expandidos
+
+# =========================
+# Buscas Bidirecionais
+# =========================
 
-    return None, nos_expandidos
+def tabela_manhattan(estado_alvo):
+    """Tabela peça x posição com a distância de Manhattan até um estado alvo qualquer."""
+    alvo = {peca: idx for idx, peca in enumerate(estado_alvo)}
+    return tuple(
+        tuple(0 if peca == 0 else
+              abs(pos // 4 - alvo[peca] // 4) + abs(pos % 4 - alvo[peca] % 4)
+              for pos in range(16))
+        for peca in range(16)
+    )
+
+def juntar_caminhos(pais_frente, pais_tras, encontro):
+    """
+    Monta o caminho completo a partir do nó de encontro: a metade de frente
+    vem de reconstruir_caminho e a de trás segue os pais rumo ao objetivo.
+    """
+    caminho = reconstruir_caminho(pais_frente, encontro)
+    codigo = pais_tras[encontro]
+    while codigo is not None:
+        caminho.append(compacto_para_estado(codigo))
+        codigo = pais_tras[codigo]
+    return caminho
+
+def bfs_bidirecional(inicial, objetivo, estatisticas=None, orcamento=None):
+    """
+    BFS bidirecional: expande, camada por camada, o lado com a menor fronteira.
+    Ao completar a camada em que os lados se encontram, o menor caminho entre
+    os encontros é ótimo. Em `estatisticas` (dict opcional) ficam os nós
+    expandidos em cada direção.
+    """
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    lados = [
+        {"pais": {codigo_inicial: None}, "distancia": {codigo_inicial: 0},
+         "fronteira": [(codigo_inicial, inicial.index(0), -1)], "expandidos": 0},
+        {"pais": {codigo_objetivo: None}, "distancia": {codigo_objetivo: 0},
+         "fronteira": [(codigo_objetivo, objetivo.index(0), -1)], "expandidos": 0},
+    ]
+    encontro = codigo_inicial if codigo_inicial == codigo_objetivo else None
+    pico_fronteira = 2
+    nos_expandidos = 0
+    verificar_em = iniciar_orcamento(orcamento)
+    esgotado = False
+
+    while not esgotado and encontro is None and lados[0]["fronteira"] and lados[1]["fronteira"]:
+        atual = 0 if len(lados[0]["fronteira"]) <= len(lados[1]["fronteira"]) else 1
+        lado, outro = lados[atual], lados[1 - atual]
+        pais, distancia, distancia_outro = lado["pais"], lado["distancia"], outro["distancia"]
+        melhor = None
+        proxima = []
+        for codigo_atual, vazio, anterior in lado["fronteira"]:
+            if nos_expandidos >= verificar_em:
+                esgotado = orcamento.esgotado(nos_expandidos)
+                if esgotado:
+                    break
+                verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+            nos_expandidos += 1
+            lado["expandidos"] += 1
+            nova_distancia = distancia[codigo_atual] + 1
+            for novo_codigo, novo_vazio in sucessores_compactos(codigo_atual, vazio, anterior):
+                if novo_codigo not in pais:
+                    pais[novo_codigo] = codigo_atual
+                    distancia[novo_codigo] = nova_distancia
+                    proxima.append((novo_codigo, novo_vazio, vazio))
+                    if novo_codigo in distancia_outro:
+                        total = nova_distancia + distancia_outro[novo_codigo]
+                        if melhor is None or total < melhor:
+                            melhor, encontro = total, novo_codigo
+        # A camada antiga e a nova coexistem até a troca
+        pico_fronteira = max(pico_fronteira, len(lado["fronteira"]) + len(proxima) + len(outro["fronteira"]))
+        lado["fronteira"] = proxima
+
+    registrar_estruturas(estatisticas, pico_fronteira, len(lados[0]["pais"]) + len(lados[1]["pais"]))
+    if estatisticas is not None:
+        estatisticas["expandidos_frente"] = lados[0]["expandidos"]
+        estatisticas["expandidos_tras"] = lados[1]["expandidos"]
+    # Interrompida no meio da camada, o encontro pode não ser o melhor
+    if encontro is None or esgotado:
+        registrar_resultado(estatisticas, None, orcamento)
+        return None, nos_expandidos
+    caminho = juntar_caminhos(lados[0]["pais"], lados[1]["pais"], encontro)
+    registrar_resultado(estatisticas, caminho, orcamento)
+    return caminho, nos_expandidos
+
+def a_star_bidirecional(inicial, objetivo, estatisticas=None, orcamento=None):
+    """
+    A* bidirecional (front-to-end): a busca de frente usa Manhattan até o
+    objetivo e a de trás Manhattan até o estado inicial. Para quando o melhor
+    encontro (mu) não supera o menor f de alguma das filas, o que preserva a
+    otimalidade com heurísticas consistentes.
+    """
+    codigo_inicial = estado_para_compacto(inicial)
+    codigo_objetivo = estado_para_compacto(objetivo)
+    lados = []
+    for codigo, estado, alvo in ((codigo_inicial, inicial, objetivo), (codigo_objetivo, objetivo, inicial)):
+        tabela = tabela_manhattan(alvo)
+        h = sum(tabela[peca][idx] for idx, peca in enumerate(estado))
+        lados.append({"tabela": tabela, "pais": {codigo: None}, "g": {codigo: 0},
+                      "fila": [(h, 0, codigo, estado.index(0), h, -1)], "expandidos": 0})
+
+    mu = 0 if codigo_inicial == codigo_objetivo else float('inf')
+    encontro = codigo_inicial if mu == 0 else None
+    pico_fronteira = 2
+    nos_expandidos = 0
+    verificar_em = iniciar_orcamento(orcamento)
+    esgotado = False
+
+    while lados[0]["fila"] and lados[1]["fila"]:
+        if mu <= max(lados[0]["fila"][0][0], lados[1]["fila"][0][0]):
+            break
+        if nos_expandidos >= verificar_em:
+            esgotado = orcamento.esgotado(nos_expandidos)
+            if esgotado:
+                break
+            verificar_em = orcamento.proxima_verificacao(nos_expandidos)
+        atual = 0 if len(lados[0]["fila"]) <= len(lados[1]["fila"]) else 1
+        lado, outro = lados[atual], lados[1 - atual]
+        fila, pais, melhor_g, g_outro, tabela = lado["fila"], lado["pais"], lado["g"], outro["g"], lado["tabela"]
+
+        f, g, codigo_atual, vazio, h, anterior = heapq.heappop(fila)
+        if g > melhor_g[codigo_atual]:
+            continue  # entrada obsoleta
+        nos_expandidos += 1
+        lado["expandidos"] += 1
+
+        desloc_vazio = DESLOCAMENTOS[vazio]
+        novo_g = g + 1
+        for destino, desloc in VIZINHOS_VAZIO[vazio]:
+            if destino == anterior:
+                continue
+            peca = (codigo_atual >> desloc) & 0xF
+            novo_codigo = codigo_atual - (peca << desloc) + (peca << desloc_vazio)
+            if novo_g < melhor_g.get(novo_codigo, novo_g + 1):
+                melhor_g[novo_codigo] = novo_g
+                pais[novo_codigo] = codigo_atual
+                distancias_peca = tabela[peca]
+                novo_h = h + distancias_peca[vazio] - distancias_peca[destino]
+                heapq.heappush(fila, (novo_g + novo_h, novo_g, novo_codigo, destino, novo_h, vazio))
+                if novo_codigo in g_outro and novo_g + g_outro[novo_codigo] < mu:
+                    mu = novo_g + g_outro[novo_codigo]
+                    encontro = novo_codigo
+        if len(fila) + len(outro["fila"]) > pico_fronteira:
+            pico_fronteira = len(fila) + len(outro["fila"])
+
+    registrar_estruturas(estatisticas, pico_fronteira, len(lados[0]["g"]) + len(lados[1]["g"]))
+    if estatisticas is not None:
+        estatisticas["expandidos_frente"] = lados[0]["expandidos"]
+        estatisticas["expandidos_tras"] = lados[1]["expandidos"]
+    # Sem o critério de parada satisfeito, mu ainda não é garantidamente ótimo
+    if encontro is None or esgotado:
+        registrar_resultado(estatisticas, None, orcamento)
+        return None, nos_expandidos
+    caminho = juntar_caminhos(lados[0]["pais"], lados[1]["pais"], encontro)
+    registrar_resultado(estatisticas, caminho, orcamento)
+    return caminho, nos_expandidos
 
 def mostrar_passos_da_solucao(solucao):
     if not solucao:
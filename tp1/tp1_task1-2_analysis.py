@@ -1,6 +1,10 @@
 from tp1_completo import *
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
+from resultados_colunares import codificar_tabuleiros_lote
 
 def teste_gerar_tabuleiro_aleatorio():
     """
@@ -16,44 +20,118 @@ def teste_gerar_tabuleiro_aleatorio():
         if not soluvel:
             break
 
-def analisar_tabuleiros(num_execucoes_array):
+# =========================
+# Geração e verificação em lote (NumPy)
+# =========================
+
+TAMANHO_LOTE = 1_000_000
+
+def gerar_tabuleiros_lote(n, rng):
+    """Gera n tabuleiros aleatórios como um array (n, 16) uint8 (0 = vazio)."""
+    base = np.tile(np.arange(16, dtype=np.uint8), (n, 1))
+    return rng.permuted(base, axis=1)
+
+def paridade_inversoes_lote(tabuleiros):
+    """Paridade (0/1) do número de inversões de cada linha de um array (n, 16)."""
+    paridade = np.zeros(len(tabuleiros), dtype=bool)
+    for i in range(15):
+        coluna = tabuleiros[:, i]
+        for j in range(i + 1, 16):
+            paridade ^= (coluna > tabuleiros[:, j]) & (tabuleiros[:, j] != 0)
+    return paridade
+
+def linha_vazio_lote(tabuleiros):
+    """Linha do espaço vazio de cada tabuleiro, contando de baixo para cima (1-4)."""
+    return 4 - np.argmax(tabuleiros == 0, axis=1) // 4
+
+def eh_soluvel_lote(tabuleiros):
+    """Versão vetorizada de eh_soluvel: solucionável quando linha + inversões é ímpar."""
+    return (linha_vazio_lote(tabuleiros) + paridade_inversoes_lote(tabuleiros)) % 2 == 1
+
+# =========================
+# Contagem de duplicados com memória limitada
+# =========================
+# As chaves são espalhadas por hash entre arquivos de partição em disco, junto
+# com o índice de geração de cada uma. Cada partição é depois lida sozinha e
+# contada com np.unique, então o pico de memória depende do tamanho do lote e
+# da partição, não do total de amostras.
+
+REGISTRO_CHAVE = np.dtype([("chave", "<u8"), ("indice", "<u8")])
+_MULTIPLICADOR_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+def numero_particoes(total):
+    """Potência de 2 de partições para que cada uma tenha ~TAMANHO_LOTE chaves."""
+    return 1 << max(0, int(np.ceil(np.log2(max(1, total / TAMANHO_LOTE)))))
+
+def gravar_particoes(chaves, inicio, arquivos):
+    """Anexa um lote de chaves (geradas a partir do índice `inicio`) aos arquivos de partição."""
+    bits = int(np.log2(len(arquivos)))
+    if bits:
+        particao = ((chaves * _MULTIPLICADOR_HASH) >> np.uint64(64 - bits)).astype(np.intp)
+    else:
+        particao = np.zeros(len(chaves), dtype=np.intp)
+    ordem = np.argsort(particao, kind="stable")
+    registros = np.empty(len(chaves), dtype=REGISTRO_CHAVE)
+    registros["chave"] = chaves[ordem]
+    registros["indice"] = inicio + ordem
+    limites = np.cumsum(np.bincount(particao, minlength=len(arquivos)))[:-1]
+    for arquivo, parte in zip(arquivos, np.split(registros, limites)):
+        parte.tofile(arquivo)
+
+def contar_unicos_particoes(caminhos, tamanhos):
+    """
+    Conta as chaves distintas entre as primeiras N gerações, para cada N em
+    `tamanhos`, lendo uma partição por vez.
+    """
+    unicos = dict.fromkeys(tamanhos, 0)
+    for caminho in caminhos:
+        registros = np.fromfile(caminho, dtype=REGISTRO_CHAVE)
+        for n in tamanhos:
+            unicos[n] += len(np.unique(registros["chave"][registros["indice"] < n]))
+        del registros
+    return unicos
+
+def analisar_tabuleiros(num_execucoes_array, semente=None, pasta_temporaria=None):
     """
     Analisa a geração de tabuleiros para cada valor no array de execuções.
-    Retorna um dicionário com os resultados para cada número de execuções.
+    Gera uma única sequência com o maior tamanho pedido (em lotes) e obtém os
+    demais tamanhos como prefixos dela; a proporção acumulada de
+    solucionáveis sai de um único cumsum. Os tabuleiros não ficam em memória:
+    viram chaves uint64 particionadas em disco para a contagem de duplicados.
+    Retorna um dicionário {num_execucoes: (proporções acumuladas, tabuleiros únicos)}.
     """
-    resultados_por_execucao = {}
+    rng = np.random.default_rng(semente)
+    total = max(num_execucoes_array)
+    soluveis = np.empty(total, dtype=bool)
+
+    with tempfile.TemporaryDirectory(dir=pasta_temporaria) as pasta:
+        caminhos = [os.path.join(pasta, f"particao-{i}.bin") for i in range(numero_particoes(total))]
+        arquivos = [open(caminho, "wb") for caminho in caminhos]
+        try:
+            for inicio in range(0, total, TAMANHO_LOTE):
+                fim = min(inicio + TAMANHO_LOTE, total)
+                tabuleiros = gerar_tabuleiros_lote(fim - inicio, rng)
+                soluveis[inicio:fim] = eh_soluvel_lote(tabuleiros)
+                gravar_particoes(codificar_tabuleiros_lote(tabuleiros), inicio, arquivos)
+        finally:
+            for arquivo in arquivos:
+                arquivo.close()
+        unicos = contar_unicos_particoes(caminhos, num_execucoes_array)
+
+    proporcoes = np.cumsum(soluveis) / np.arange(1, total + 1) * 100
 
+    resultados_por_execucao = {}
     for num_execucoes in num_execucoes_array:
-        resultados = []
-        solucionaveis = 0
-        tabuleiros_gerados = []
-
-        for exec_num in range(1, num_execucoes + 1):
-            tabuleiro = gerar_tabuleiro_aleatorio()
-            tabuleiros_gerados.append(tabuleiro)
-            is_soluvel = eh_soluvel(tabuleiro)
-            if is_soluvel:
-                solucionaveis += 1
-
-            proporcao_atual = (solucionaveis / exec_num) * 100
-            resultados.append(proporcao_atual)
-
+        solucionaveis = int(np.count_nonzero(soluveis[:num_execucoes]))
         print(f"\nTotal: {solucionaveis} tabuleiros solucionáveis de {num_execucoes}")
-        resultados_por_execucao[num_execucoes] = (resultados, tabuleiros_gerados)
+        resultados_por_execucao[num_execucoes] = (proporcoes[:num_execucoes], unicos[num_execucoes])
 
     return resultados_por_execucao
 
-def analisar_tabuleiros_iguais(tabuleiros_gerados):
+def analisar_tabuleiros_iguais(total_tabuleiros, total_tabuleiros_unicos):
     """
-    Analisa a quantidade de tabuleiros duplicados em um array fornecido.
+    Exibe a quantidade de tabuleiros duplicados a partir dos totais gerados e únicos.
     """
-    contagem = {}
-    for tabuleiro in tabuleiros_gerados:
-        t = tuple(tuple(linha) for linha in tabuleiro)
-        contagem[t] = contagem.get(t, 0) + 1
-
-    total_tabuleiros_unicos = len(contagem)
-    total_tabuleiros = len(tabuleiros_gerados)
     total_duplicados = total_tabuleiros - total_tabuleiros_unicos
     porcentagem_duplicados = (total_duplicados / total_tabuleiros) * 100
 
@@ -65,7 +143,7 @@ def plotar_resultados_analise_tabuleiros(resultados):
     """
     Plota um gráfico com os resultados acumulados da análise.
     """
-    execucoes = list(range(1, len(resultados) + 1))
+    execucoes = np.arange(1, len(resultados) + 1)
     valor_final = resultados[-1]
 
     plt.figure(figsize=(10, 6))  # Ajusta o tamanho do gráfico
@@ -99,21 +177,67 @@ def gerar_tabuleiros_ate_encontrar_igual():
         gerados.add(t)
         contador += 1
 
+# =========================
+# Experimento do aniversário (paralelo)
+# =========================
+
+def geracoes_ate_repeticao(semente, tamanho_lote=TAMANHO_LOTE):
+    """
+    Gera tabuleiros aleatórios (em lotes) até o primeiro repetido e retorna
+    em qual geração ele apareceu. Os tabuleiros já vistos ficam como chaves
+    uint64 num array ordenado (8 bytes por tabuleiro); a busca usa
+    searchsorted e cada lote novo é intercalado ao array.
+    """
+    rng = np.random.default_rng(semente)
+    vistos = np.empty(0, dtype=np.uint64)
+    geradas = 0
+    while True:
+        chaves = codificar_tabuleiros_lote(gerar_tabuleiros_lote(tamanho_lote, rng))
+
+        posicoes = np.searchsorted(vistos, chaves)
+        ja_vistos = np.zeros(len(chaves), dtype=bool)
+        if len(vistos):
+            ja_vistos = vistos[np.minimum(posicoes, len(vistos) - 1)] == chaves
+        _, primeiras, inversa = np.unique(chaves, return_index=True, return_inverse=True)
+        repetidos_no_lote = primeiras[inversa] < np.arange(len(chaves))
+
+        repetidos = np.flatnonzero(ja_vistos | repetidos_no_lote)
+        if repetidos.size:
+            return geradas + int(repetidos[0]) + 1
+        vistos = np.sort(np.concatenate((vistos, chaves)), kind="mergesort")
+        geradas += len(chaves)
+
+def experimento_repeticoes(num_testes=100, semente=None, processos=None,
+                           arquivo_saida="dados_duplicacoes.txt"):
+    """
+    Executa `num_testes` rodadas de geracoes_ate_repeticao em um pool de
+    processos, cada uma com um fluxo aleatório independente (SeedSequence.spawn).
+    Os resultados são gravados como "indice geracoes", formato lido por grafico.py.
+    """
+    sementes = np.random.SeedSequence(semente).spawn(num_testes)
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos) as executor, \
+            open(arquivo_saida, "w", encoding="utf-8") as saida:
+        for indice, geracoes in enumerate(executor.map(geracoes_ate_repeticao, sementes), start=1):
+            print(f"({indice}) Tabuleiro repetido encontrado após {geracoes} gerações.")
+            saida.write(f"{indice} {geracoes}\n")
+            saida.flush()
+            resultados.append(geracoes)
+    return resultados
+
 if __name__ == "__main__":
     # Análise com diferentes números de execuções
     execucoes_array = [100, 1000, 10000, 100000,1000000,10000000]
     # execucoes_array = [10]
     resultados_por_execucao = analisar_tabuleiros(execucoes_array)
 
-    for num_execucoes, (resultados, tabuleiros_gerados) in resultados_por_execucao.items():
+    for num_execucoes, (resultados, tabuleiros_unicos) in resultados_por_execucao.items():
         print(f"Plotando resultados para {num_execucoes} execuções...")
         plotar_resultados_analise_tabuleiros(resultados)
         print(f"Analisando tabuleiros duplicados para {num_execucoes} execuções...")
-        analisar_tabuleiros_iguais(tabuleiros_gerados)
+        analisar_tabuleiros_iguais(num_execucoes, tabuleiros_unicos)
 
     print(f"Gerando tabuleiros até encontrar um igual")
-    for i in range(100):
-        print(f"({i + 1})",end=" ")
-        gerar_tabuleiros_ate_encontrar_igual()
+    experimento_repeticoes(num_testes=100)
 
 
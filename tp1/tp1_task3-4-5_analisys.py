@@ -1,174 +1,459 @@
 import time
 import csv
+import json
 import os
+import sys
 import psutil
 import random
-import threading
+from multiprocessing import Pool
 from tp1_completo import *
+from resultados_colunares import gravar_resultados_colunares, ORDEM_ALGORITMOS, CORES_ALGORITMOS
+from cache_solucoes import CacheSolucoes
+from automato_poda import carregar_automato
 
-def executar_iteracao(profundidade_maxima, qtd_movimentos, seed):
-    resultados_iteracao = {}
+def dfs_poda(inicial, objetivo, profundidade_maxima, estatisticas=None, orcamento=None):
+    """IDDFS com o autômato de poda de sequências duplicadas (automato_poda)."""
+    return dfs(inicial, objetivo, profundidade_maxima, estatisticas, orcamento,
+               automato=carregar_automato())
 
-    # Dados de processamento antes (overall iteration)
+def ida_star_poda(inicial, objetivo, estatisticas=None, orcamento=None):
+    """IDA* com o autômato de poda de sequências duplicadas (automato_poda)."""
+    return ida_star(inicial, objetivo, estatisticas=estatisticas, orcamento=orcamento,
+                    automato=carregar_automato())
+
+# Tabela de transposição das variantes -TT: 1_000_003 posições (cerca de 13 MB)
+CAPACIDADE_TABELA = 1_000_003
+POLITICA_TABELA = "profundidade"
+
+def dfs_tabela(inicial, objetivo, profundidade_maxima, estatisticas=None, orcamento=None):
+    """IDDFS com uma tabela de transposição de tamanho fixo."""
+    return dfs(inicial, objetivo, profundidade_maxima, estatisticas, orcamento,
+               tabela=TabelaTransposicao(CAPACIDADE_TABELA, POLITICA_TABELA))
+
+def ida_star_tabela(inicial, objetivo, estatisticas=None, orcamento=None):
+    """IDA* com uma tabela de transposição de tamanho fixo."""
+    return ida_star(inicial, objetivo, estatisticas=estatisticas, orcamento=orcamento,
+                    tabela=TabelaTransposicao(CAPACIDADE_TABELA, POLITICA_TABELA))
+
+# A* ponderado (custo até PESO_PONDERADO x ótimo) e A* anytime, que parte de
+# uma solução com PESO_ANYTIME e melhora até provar a ótima ou até o prazo (s)
+PESO_PONDERADO = 2
+PESO_ANYTIME = 3
+PRAZO_ANYTIME = 10
+
+def a_star_ponderado(inicial, objetivo, estatisticas=None, orcamento=None):
+    """A* com f = g + PESO_PONDERADO·h."""
+    return a_star(inicial, objetivo, estatisticas=estatisticas, orcamento=orcamento,
+                  peso=PESO_PONDERADO)
+
+def a_star_anytime_harness(inicial, objetivo, estatisticas=None, orcamento=None):
+    """A* anytime com prazo; cada melhoria é impressa assim que encontrada."""
+    def ao_melhorar(custo, segundos, nos_expandidos):
+        print(f"[A*-Anytime pid {os.getpid()}] custo {custo} em {segundos:.3f}s "
+              f"({nos_expandidos} nós expandidos)", flush=True)
+    return a_star_anytime(inicial, objetivo, peso=PESO_ANYTIME, prazo=PRAZO_ANYTIME,
+                          estatisticas=estatisticas, orcamento=orcamento, ao_melhorar=ao_melhorar)
+
+# Algoritmos avaliados: nome -> (função, recebe profundidade_maxima).
+# Todas as funções aceitam o argumento opcional `estatisticas`. Um algoritmo
+# novo entra também em ORDEM_ALGORITMOS/CORES_ALGORITMOS (resultados_colunares)
+# para aparecer nos gráficos das análises com cor própria.
+ALGORITMOS = {
+    "BFS": (bfs, False),
+    "DFS": (dfs, True),
+    "DFS-Poda": (dfs_poda, True),
+    "DFS-TT": (dfs_tabela, True),
+    "A*": (a_star, False),
+    "WA*": (a_star_ponderado, False),
+    "A*-Anytime": (a_star_anytime_harness, False),
+    "IDA*": (ida_star, False),
+    "IDA*-Poda": (ida_star_poda, False),
+    "IDA*-TT": (ida_star_tabela, False),
+    "BFS-Bi": (bfs_bidirecional, False),
+    "A*-Bi": (a_star_bidirecional, False),
+}
+assert set(ALGORITMOS) == set(ORDEM_ALGORITMOS) == set(CORES_ALGORITMOS)
+
+# Algoritmos cujas soluções são ótimas: só eles consultam e alimentam o cache
+ALGORITMOS_OTIMOS = {"BFS", "A*", "IDA*", "IDA*-Poda", "IDA*-TT", "BFS-Bi", "A*-Bi"}
+
+# Variantes com o autômato de poda -> algoritmo base, comparados no resumo
+VARIANTES_PODA = {"DFS-Poda": "DFS", "IDA*-Poda": "IDA*"}
+
+# Colunas do CSV de resultados, na ordem em que são gravadas
+COLUNAS_CSV = [
+    "Iteration", "Algorithm", "Time", "CPUTime", "Expanded", "Found",
+    "Steps", "Directions", "InitialBoard", "Solvable",
+    "ProfundidadeMaximaDFS", "QtdMovimentos", "Seed", "Inversoes", "LinhaVazio",
+    "MemMBInicio", "MemMBFim", "PID", "ExpandidosFrente", "ExpandidosTras",
+    "DuplicadosPodados", "ObsoletosDescartados", "Reaberturas", "PodasAutomato",
+    "TaxaAcertosTabela", "Melhorias", "MemPicoMB", "PicoFronteira", "PicoVisitados",
+    "Resultado", "MotivoOrcamento", "LimiteExpansoes", "LimiteTempo", "LimiteMemoriaMB",
+    "Cache"
+]
+
+def executar_job(job):
+    """
+    Executa um único algoritmo sobre o tabuleiro de uma iteração.
+    `job` é (iteração, algoritmo, profundidade_maxima, qtd_movimentos, seed,
+    limites, cache), com limites = (max_expansoes, tempo_maximo,
+    memoria_maxima_mb) e cache o arquivo do cache de soluções (ou None);
+    o tabuleiro é regerado a partir da seed, então o job pode rodar em
+    qualquer processo. Retorna a linha do CSV como dicionário.
+
+    Se algum limite for atingido, a busca para sozinha e a linha sai com
+    Resultado = orcamento_esgotado e os nós expandidos até ali.
+
+    Com cache, os algoritmos ótimos consultam o cache antes da busca (num
+    acerto nada é expandido) e gravam nele as soluções que encontrarem; a
+    coluna Cache registra "acerto" ou "falta".
+
+    MemPicoMB é o pico de RSS do processo durante a busca menos o RSS antes
+    dela; PicoFronteira e PicoVisitados vêm das estatísticas do algoritmo.
+    """
+    iteracao, algoritmo, profundidade_maxima, qtd_movimentos, seed, limites, cache = job
     process = psutil.Process(os.getpid())
-    wall_start = time.time()
 
     # Gerar um tabuleiro inicial solucionável com seed fixa
     random.seed(seed)
     tabuleiro_soluvel = gerar_estado_inicial_soluvel(qtd_movimentos=qtd_movimentos)
-    resultados_iteracao["initial_state"] = tabuleiro_soluvel
-    resultados_iteracao["is_solvable"] = eh_soluvel(tabuleiro_soluvel)
-    resultados_iteracao["qtd_movimentos"] = qtd_movimentos
-    resultados_iteracao["seed"] = seed
-    resultados_iteracao["inversoes"] = contar_inversoes(tabuleiro_soluvel)
-    resultados_iteracao["linha_vazio"] = posicao_linha_vazio(tabuleiro_soluvel)
-    resultados_iteracao["profundidade_maxima"] = profundidade_maxima
-
     inicial = tabuleiro_para_estado(tabuleiro_soluvel)
     meta = tabuleiro_para_estado(objetivo)
 
-    alg_results = {}
-
-    def run_algorithm(algorithm_name, algorithm_func, *args):
-        t_cpu_start = time.thread_time()
-        t_wall_start = time.time()
-        mem_start = process.memory_info().rss / (1024 * 1024)  # MB
-        solution, expanded = algorithm_func(*args)
-        t_cpu_end = time.thread_time()
-        t_wall_end = time.time()
-        mem_end = process.memory_info().rss / (1024 * 1024)  # MB
-
-        if solution:
-            directions = converter_caminho_em_direcoes(inicial, solution)
-            step_count = len(solution) - 1
-        else:
-            directions = []
-            step_count = 0
-
-        alg_results[algorithm_name] = {
-            "time": t_wall_end - t_wall_start,
-            "cpu_time": t_cpu_end - t_cpu_start,
-            "expanded": expanded,
-            "found": bool(solution),
-            "directions": directions,
-            "step_count": step_count,
-            "mem_MB_inicio": mem_start,
-            "mem_MB_fim": mem_end
-        }
-
-    # Create and start threads for each algorithm
-    threads = []
-    for name, func in [("BFS", bfs), ("DFS", dfs), ("A*", a_star)]:
-        t = threading.Thread(target=run_algorithm, args=(name, func, inicial, meta) if name != "DFS" else (name, func, inicial, meta, profundidade_maxima))
-        t.start()
-        threads.append(t)
-    for t in threads:
-        t.join()
-
-    # Dados de processamento depois (overall iteration)
-    wall_end = time.time()
-
-    resultados_iteracao["BFS"] = alg_results["BFS"]
-    resultados_iteracao["DFS"] = alg_results["DFS"]
-    resultados_iteracao["A*"] = alg_results["A*"]
-    resultados_iteracao["processamento"] = {
-        "wall_time_total": wall_end - wall_start,
-        "pid": os.getpid()
+    func, usa_profundidade = ALGORITMOS[algoritmo]
+    args = (inicial, meta, profundidade_maxima) if usa_profundidade else (inicial, meta)
+    estatisticas = {}
+    orcamento = Orcamento(*limites) if any(l is not None for l in limites) else None
+
+    t_cpu_start = time.process_time()
+    t_wall_start = time.time()
+    mem_start = process.memory_info().rss / (1024 * 1024)  # MB
+    if cache is not None and algoritmo in ALGORITMOS_OTIMOS:
+        with CacheSolucoes(cache) as cache_solucoes:
+            solution = cache_solucoes.buscar(inicial)
+            if solution is not None:
+                expanded = 0
+                estatisticas["resultado"] = ENCONTRADO
+                uso_cache = "acerto"
+            else:
+                solution, expanded = func(*args, estatisticas=estatisticas, orcamento=orcamento)
+                if solution is not None:
+                    cache_solucoes.guardar(inicial, solution)
+                uso_cache = "falta"
+    else:
+        solution, expanded = func(*args, estatisticas=estatisticas, orcamento=orcamento)
+        uso_cache = ""
+    t_cpu_end = time.process_time()
+    t_wall_end = time.time()
+    mem_end = process.memory_info().rss / (1024 * 1024)  # MB
+    # Cada job roda em um processo novo, então o pico pertence a este algoritmo
+    mem_pico = max(pico_rss_mb(process), mem_end) - mem_start
+
+    if solution:
+        directions = converter_caminho_em_direcoes(inicial, solution)
+        step_count = len(solution) - 1
+    else:
+        directions = []
+        step_count = 0
+
+    return {
+        "Iteration": iteracao,
+        "Algorithm": algoritmo,
+        "Time": t_wall_end - t_wall_start,
+        "CPUTime": t_cpu_end - t_cpu_start,
+        "Expanded": expanded,
+        "Found": bool(solution),
+        "Steps": step_count,
+        "Directions": directions,
+        "InitialBoard": str(tabuleiro_soluvel),
+        "Solvable": str(eh_soluvel(tabuleiro_soluvel)),
+        "ProfundidadeMaximaDFS": profundidade_maxima if usa_profundidade else "",
+        "QtdMovimentos": qtd_movimentos,
+        "Seed": seed,
+        "Inversoes": contar_inversoes(tabuleiro_soluvel),
+        "LinhaVazio": posicao_linha_vazio(tabuleiro_soluvel),
+        "MemMBInicio": mem_start,
+        "MemMBFim": mem_end,
+        "PID": os.getpid(),
+        "ExpandidosFrente": estatisticas.get("expandidos_frente", ""),
+        "ExpandidosTras": estatisticas.get("expandidos_tras", ""),
+        "DuplicadosPodados": estatisticas.get("duplicados_podados", ""),
+        "ObsoletosDescartados": estatisticas.get("obsoletos_descartados", ""),
+        "Reaberturas": estatisticas.get("reaberturas", ""),
+        "PodasAutomato": estatisticas.get("podas_automato", ""),
+        "TaxaAcertosTabela": estatisticas.get("taxa_acertos_tabela", ""),
+        # Melhorias do A* anytime como "custo:segundos:nós" separadas por ";"
+        "Melhorias": ";".join(f"{c}:{t:.4f}:{n}" for c, t, n in estatisticas.get("melhorias", ())),
+        "MemPicoMB": mem_pico,
+        "PicoFronteira": estatisticas.get("pico_fronteira", ""),
+        "PicoVisitados": estatisticas.get("pico_visitados", ""),
+        "Resultado": estatisticas.get("resultado", ""),
+        "MotivoOrcamento": estatisticas.get("motivo_orcamento", ""),
+        "LimiteExpansoes": limites[0] if limites[0] is not None else "",
+        "LimiteTempo": limites[1] if limites[1] is not None else "",
+        "LimiteMemoriaMB": limites[2] if limites[2] is not None else "",
+        "Cache": uso_cache
     }
-    return resultados_iteracao
 
-def gerar_relatorio_final(iteration_results, resultados, iteracoes):
-    # Agora lemos somente o arquivo gerado e calculamos as médias no final
-    dados_por_algoritmo = {"BFS": [], "DFS": [], "A*": []}
+def executar_jobs(jobs, processos=None, isolado=False):
+    """
+    Gera os resultados dos jobs à medida que terminam. Por padrão usa um pool
+    com `processos` processos (todos os núcleos se None); no modo `isolado`
+    os jobs rodam um de cada vez, na ordem, para tempos sem concorrência.
+    Em ambos os casos cada job ganha um processo novo (maxtasksperchild=1),
+    para que a memória medida seja só a dele.
+    """
+    if isolado:
+        with Pool(processes=1, maxtasksperchild=1) as pool:
+            yield from pool.imap(executar_job, jobs)
+        return
+    with Pool(processes=processos, maxtasksperchild=1) as pool:
+        yield from pool.imap_unordered(executar_job, jobs)
+
+# Arquivos de retomada: o manifesto fixa os jobs (e suas seeds) de uma
+# execução; o diário recebe uma linha JSON por job concluído.
+ARQUIVO_MANIFESTO = "manifesto.json"
+ARQUIVO_DIARIO = "diario.jsonl"
 
-    with open("resultados.csv", "r", newline='', encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            alg = row["Algorithm"]
-            if alg in dados_por_algoritmo:
-                dados_por_algoritmo[alg].append(row)
+def chave_job(iteracao, algoritmo, seed):
+    """Identifica um job no manifesto e no diário."""
+    return int(iteracao), algoritmo, int(seed)
+
+def preparar_manifesto(config, retomar=True, arquivo_manifesto=ARQUIVO_MANIFESTO,
+                       arquivo_diario=ARQUIVO_DIARIO):
+    """
+    Retorna a lista de jobs da execução descrita por `config`. Com `retomar`,
+    reaproveita o manifesto existente (mesmas seeds) se ele tiver a mesma
+    configuração e ainda houver jobs fora do diário, ou seja, se a execução
+    anterior foi interrompida. Nos demais casos (sem `retomar`, sem
+    manifesto, execução anterior completa ou com outra configuração), sorteia
+    novas seeds, grava um novo manifesto e zera o diário.
+    """
+    if retomar and os.path.exists(arquivo_manifesto):
+        with open(arquivo_manifesto, "r", encoding="utf-8") as f:
+            manifesto = json.load(f)
+        jobs = [tuple(job) for job in manifesto["jobs"]]
+        concluidos = {chave_job(row["Iteration"], row["Algorithm"], row["Seed"])
+                      for row in carregar_diario(arquivo_diario)}
+        if manifesto["config"] == config and any(
+                chave_job(job[0], job[1], job[4]) not in concluidos for job in jobs):
+            return jobs
+
+    # Um job por (iteração, algoritmo); todos os algoritmos de uma iteração
+    # compartilham a mesma seed e, portanto, o mesmo tabuleiro.
+    jobs = []
+    for i in range(config["iteracoes"]):
+        seed = random.randint(0, 99999999)
+        for alg in config["algoritmos"]:
+            jobs.append((i + 1, alg, config["profundidade_maxima"], config["qtd_movimentos"],
+                         seed, tuple(config["limites"]), config.get("cache")))
+
+    temporario = arquivo_manifesto + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump({"config": config, "jobs": jobs}, f)
+    os.replace(temporario, arquivo_manifesto)
+    open(arquivo_diario, "w").close()
+    return jobs
+
+def carregar_diario(arquivo_diario=ARQUIVO_DIARIO):
+    """
+    Lê as linhas dos jobs concluídos. Uma última linha incompleta (queda no
+    meio da escrita) é ignorada; o job correspondente roda de novo.
+    """
+    if not os.path.exists(arquivo_diario):
+        return []
+    linhas = []
+    with open(arquivo_diario, "r", encoding="utf-8") as f:
+        for texto in f:
+            try:
+                linhas.append(json.loads(texto))
+            except json.JSONDecodeError:
+                break
+    return linhas
+
+def reescrever_diario(linhas, arquivo_diario=ARQUIVO_DIARIO):
+    """Regrava o diário só com linhas válidas, descartando um final incompleto."""
+    temporario = arquivo_diario + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        for linha in linhas:
+            f.write(json.dumps(linha) + "\n")
+    os.replace(temporario, arquivo_diario)
+
+def registrar_no_diario(diario, linha):
+    """Acrescenta um job concluído ao diário e força a gravação em disco."""
+    diario.write(json.dumps(linha) + "\n")
+    diario.flush()
+    os.fsync(diario.fileno())
+
+def gerar_relatorio_final(iteration_results=None, resultados=None, iteracoes=None,
+                          arquivo_diario=ARQUIVO_DIARIO):
+    """
+    Acrescenta ao resultados.csv o resumo por algoritmo, calculado somente a
+    partir do diário; pode ser chamado sozinho depois de uma execução
+    interrompida. Sem `resultados`/`iteracoes`, usa os presentes no diário.
+    """
+    linhas = carregar_diario(arquivo_diario)
+    if resultados is None:
+        resultados = list(dict.fromkeys(row["Algorithm"] for row in linhas))
+    if iteracoes is None:
+        iteracoes = len({row["Iteration"] for row in linhas})
+    dados_por_algoritmo = {alg: [] for alg in resultados}
+    for row in linhas:
+        alg = row["Algorithm"]
+        if alg in dados_por_algoritmo:
+            dados_por_algoritmo[alg].append(row)
 
     with open("resultados.csv", "a", newline='', encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow([])
-        writer.writerow(["Algorithm", "Avg Time", "Avg Expanded", "Solutions Found/Iterations"])
+        writer.writerow(["Algorithm", "Avg Time", "Avg Expanded", "Solutions Found/Iterations",
+                         "Budget Exhausted", "Cache Hits", "Cache Misses"])
 
         for alg, dados in dados_por_algoritmo.items():
-            soma_tempo = sum(float(d["Time"]) for d in dados)
-            soma_expandidos = sum(int(d["Expanded"]) for d in dados)
-            solucoes = sum(1 for d in dados if d["Found"] == "True")
-            media_tempo = soma_tempo / len(dados) if dados else 0
-            media_expandidos = soma_expandidos / len(dados) if dados else 0
+            # Acertos de cache não buscam nada: ficam fora das médias e só
+            # aparecem na coluna Cache Hits
+            buscados = [d for d in dados if d.get("Cache") != "acerto"]
+            soma_tempo = sum(d["Time"] for d in buscados)
+            soma_expandidos = sum(d["Expanded"] for d in buscados)
+            solucoes = sum(1 for d in dados if d["Found"])
+            esgotados = sum(1 for d in dados if d.get("Resultado") == ORCAMENTO_ESGOTADO)
+            acertos = len(dados) - len(buscados)
+            faltas = sum(1 for d in dados if d.get("Cache") == "falta")
             writer.writerow([
                 alg,
-                f"{media_tempo:.4f}",
-                f"{media_expandidos:.2f}",
-                f"{solucoes}/{iteracoes}"
+                f"{soma_tempo / len(buscados):.4f}" if buscados else "",
+                f"{soma_expandidos / len(buscados):.2f}" if buscados else "",
+                f"{solucoes}/{iteracoes}",
+                esgotados,
+                acertos,
+                faltas
             ])
 
-def testar_algoritmos(iteracoes, profundidade_maxima=30, qtd_movimentos=10):
+        # Redução de nós expandidos pelo autômato de poda, nas iterações em
+        # que a variante e o algoritmo base rodaram sem acerto de cache
+        pares = [(variante, base) for variante, base in VARIANTES_PODA.items()
+                 if variante in dados_por_algoritmo and base in dados_por_algoritmo]
+        if pares:
+            writer.writerow([])
+            writer.writerow(["Pruning Automaton", "Base", "Iterations", "Avg Expanded Base",
+                             "Avg Expanded Pruned", "Reduction %"])
+        for variante, base in pares:
+            expandidos = {}
+            for alg in (base, variante):
+                expandidos[alg] = {d["Iteration"]: d["Expanded"] for d in dados_por_algoritmo[alg]
+                                   if d.get("Cache") != "acerto"}
+            comuns = expandidos[base].keys() & expandidos[variante].keys()
+            soma_base = sum(expandidos[base][i] for i in comuns)
+            soma_variante = sum(expandidos[variante][i] for i in comuns)
+            writer.writerow([
+                variante,
+                base,
+                len(comuns),
+                f"{soma_base / len(comuns):.2f}" if comuns else "",
+                f"{soma_variante / len(comuns):.2f}" if comuns else "",
+                f"{100 * (1 - soma_variante / soma_base):.1f}" if soma_base else ""
+            ])
+
+def testar_algoritmos(iteracoes, profundidade_maxima=30, qtd_movimentos=10, algoritmos=None,
+                      processos=None, isolado=False, max_expansoes=None, tempo_maximo=None,
+                      memoria_maxima_mb=None, retomar=True, cache=None):
+    """
+    Roda os algoritmos em `iteracoes` tabuleiros e grava resultados.csv.
+    max_expansoes, tempo_maximo (s) e memoria_maxima_mb limitam cada job;
+    um job que os atinge é registrado como orçamento esgotado em vez de
+    travar o benchmark.
+
+    Os jobs vêm de manifesto.json e cada job concluído vai para diario.jsonl.
+    Com `retomar`, uma execução interrompida com a mesma configuração
+    continua de onde parou: os jobs do diário não rodam de novo e
+    resultados.csv é refeito a partir dele. Se a anterior terminou ou tinha
+    outra configuração, começa uma execução nova, com novas seeds.
+    `cache` é o arquivo SQLite do cache de soluções (ver cache_solucoes),
+    compartilhado entre iterações, algoritmos e execuções; None desativa.
+    Ao final, as mesmas linhas também são gravadas em resultados.npz
+    (formato colunar, ver resultados_colunares).
+    """
+    if algoritmos is None:
+        algoritmos = list(ALGORITMOS)
+    config = {
+        "iteracoes": iteracoes, "profundidade_maxima": profundidade_maxima,
+        "qtd_movimentos": qtd_movimentos, "algoritmos": list(algoritmos),
+        "limites": [max_expansoes, tempo_maximo, memoria_maxima_mb],
+        "cache": cache,
+    }
+    jobs = preparar_manifesto(config, retomar)
+    iteration_results = carregar_diario()
+    concluidos = {chave_job(row["Iteration"], row["Algorithm"], row["Seed"]) for row in iteration_results}
+    pendentes = [job for job in jobs if chave_job(job[0], job[1], job[4]) not in concluidos]
+    if concluidos:
+        print(f"Retomando: {len(concluidos)} jobs já concluídos, {len(pendentes)} pendentes.")
+        reescrever_diario(iteration_results)
+    if any(job[1] in VARIANTES_PODA for job in pendentes):
+        # Gera o autômato uma vez aqui, antes que cada processo do pool tente gerá-lo
+        carregar_automato()
+
     resultados = {
-        "BFS": {"tempo_total": 0, "nos_expandidos_total": 0, "solucoes_encontradas": 0},
-        "DFS": {"tempo_total": 0, "nos_expandidos_total": 0, "solucoes_encontradas": 0},
-        "A*": {"tempo_total": 0, "nos_expandidos_total": 0, "solucoes_encontradas": 0},
+        alg: {"tempo_total": 0, "nos_expandidos_total": 0, "solucoes_encontradas": 0}
+        for alg in algoritmos
     }
-    iteration_results = []
 
-    # Update CSV header to use algorithm-specific processing fields
-    with open("resultados.csv", "w", newline='', encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([
-            "Iteration", "Algorithm", "Time", "CPUTime", "Expanded", "Found",
-            "Steps", "Directions", "InitialBoard", "Solvable",
-            "ProfundidadeMaximaDFS", "QtdMovimentos", "Seed", "Inversoes", "LinhaVazio",
-            "MemMBInicio", "MemMBFim", "PID"
-        ])
-
-    for i in range(iteracoes):
-        seed = random.randint(0, 99999999)
-        iter_data = executar_iteracao(profundidade_maxima, qtd_movimentos, seed)
-        iteration_results.append(iter_data)
-
-        # Write data for each algorithm separately
-        with open("resultados.csv", "a", newline='', encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            for alg in ["BFS", "DFS", "A*"]:
-                writer.writerow([
-                    i + 1,
-                    alg,
-                    iter_data[alg]["time"],
-                    iter_data[alg].get("cpu_time", ""),  # per-thread CPU time
-                    iter_data[alg]["expanded"],
-                    iter_data[alg]["found"],
-                    iter_data[alg]["step_count"],
-                    iter_data[alg]["directions"],
-                    str(iter_data["initial_state"]),
-                    str(iter_data["is_solvable"]),
-                    iter_data["profundidade_maxima"] if alg == "DFS" else "",
-                    iter_data["qtd_movimentos"],
-                    iter_data["seed"],
-                    iter_data["inversoes"],
-                    iter_data["linha_vazio"],
-                    iter_data[alg].get("mem_MB_inicio", ""),
-                    iter_data[alg].get("mem_MB_fim", ""),
-                    iter_data["processamento"].get("pid", "")
-                ])
-
-        # Update results for each algorithm separately
-        for alg in ["BFS", "DFS", "A*"]:
-            resultados[alg]["tempo_total"] += iter_data[alg]["time"]
-            resultados[alg]["nos_expandidos_total"] += iter_data[alg]["expanded"]
-            if iter_data[alg]["found"]:
-                resultados[alg]["solucoes_encontradas"] += 1
+    def acumular(linha):
+        alg = linha["Algorithm"]
+        if linha.get("Cache") != "acerto":
+            resultados[alg]["tempo_total"] += linha["Time"]
+            resultados[alg]["nos_expandidos_total"] += linha["Expanded"]
+        if linha["Found"]:
+            resultados[alg]["solucoes_encontradas"] += 1
+
+    with open("resultados.csv", "w", newline='', encoding="utf-8") as csvfile, \
+            open(ARQUIVO_DIARIO, "a", encoding="utf-8") as diario:
+        writer = csv.DictWriter(csvfile, fieldnames=COLUNAS_CSV)
+        writer.writeheader()
+        for linha in iteration_results:
+            writer.writerow(linha)
+            acumular(linha)
+        csvfile.flush()
 
+        # Cada job é registrado no diário (e no CSV) assim que termina
+        for linha in executar_jobs(pendentes, processos, isolado):
+            registrar_no_diario(diario, linha)
+            writer.writerow(linha)
+            csvfile.flush()
+            iteration_results.append(linha)
+            acumular(linha)
+
+    gravar_resultados_colunares(iteration_results, "resultados.npz")
     gerar_relatorio_final(iteration_results, resultados, iteracoes)
 
+def comparar_com_resultados(caminho_csv, algoritmo="A*"):
+    """
+    Reexecuta o algoritmo nos tabuleiros iniciais de um CSV de resultados
+    anterior (ex.: resultados_analise-5-30-10/resultados-5-30-10.csv) e
+    compara os nós expandidos gravados com os da implementação atual.
+    """
+    import ast
+
+    func, usa_profundidade = ALGORITMOS[algoritmo]
+    meta = tabuleiro_para_estado(objetivo)
+    with open(caminho_csv, "r", newline='', encoding="utf-8") as csvfile:
+        linhas = [row for row in csv.DictReader(csvfile) if row.get("Algorithm") == algoritmo]
+
+    print(f"{'Iteração':>8} {'Antes':>10} {'Agora':>10} {'Passos':>7} {'Duplicados':>11}")
+    for row in linhas:
+        inicial = tabuleiro_para_estado(ast.literal_eval(row["InitialBoard"]))
+        estatisticas = {}
+        args = (inicial, meta, int(row["ProfundidadeMaximaDFS"])) if usa_profundidade else (inicial, meta)
+        solucao, expandidos = func(*args, estatisticas=estatisticas)
+        print(f"{row['Iteration']:>8} {row['Expanded']:>10} {expandidos:>10} "
+              f"{len(solucao) if solucao else '-':>7} {estatisticas.get('duplicados_podados', ''):>11}")
+
 if __name__ == "__main__":
     testar_algoritmos(iteracoes=5, profundidade_maxima=10, qtd_movimentos=10)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=20, qtd_movimentos=10)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=30, qtd_movimentos=10)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=40, qtd_movimentos=10)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=50, qtd_movimentos=10) Nao rodou em tempo viavel
+    # testar_algoritmos(iteracoes=5, profundidade_maxima=50, qtd_movimentos=10, tempo_maximo=60, memoria_maxima_mb=4096)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=30, qtd_movimentos=5)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=30, qtd_movimentos=15)
     # testar_algoritmos(iteracoes=5, profundidade_maxima=30, qtd_movimentos=20)